@@ -0,0 +1,136 @@
+"""Memory used by the entity objects of a synthetic tenant.
+
+Compares the __slots__ entities, with and without original_data, against the previous layout (a __dict__ per
+object plus the original_data copy of the JSON kwargs). The tenant is decoded from a JSON body inside the measured
+window, so the field values and the payloads kept as original_data count like in a real load. Run from the
+repository root:
+
+    python -m benchmarks.entity_memory --workspaces 2000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from src.APIBeacon.context import ClientContext
+from src.APIBeacon.workspace import Workspace
+
+
+class _Parent:
+    """Stands in for Service, entities only need its client context."""
+
+    def __init__(self, keep_original_data: bool) -> None:
+        self.context = ClientContext(api=None, logger=None, keep_original_data=keep_original_data)
+
+
+class _DictEntity:
+    """Previous layout of the entities: every attribute in a per-instance __dict__."""
+
+
+def synthetic_tenant(workspaces: int, reports: int, semantic_models: int, users: int) -> list:
+    """Returns workspace payloads shaped like the API responses."""
+    tenant = []
+    for w in range(workspaces):
+        workspace_id = f"00000000-0000-0000-0000-{w:012d}"
+        tenant.append({
+            "id": workspace_id,
+            "name": f"Workspace {w}",
+            "isReadOnly": False,
+            "isOnDedicatedCapacity": w % 2 == 0,
+            "capacityId": "11111111-1111-1111-1111-111111111111",
+            "reports": [
+                {
+                    "id": f"{workspace_id}-r{r}", "name": f"Report {r}", "datasetId": f"{workspace_id}-d{r % semantic_models}",
+                    "reportType": "PowerBIReport", "webUrl": f"https://app.powerbi.com/groups/{workspace_id}/reports/{r}",
+                    "embedUrl": f"https://app.powerbi.com/reportEmbed?reportId={r}&groupId={workspace_id}",
+                    "createdBy": "owner@contoso.com", "modifiedBy": "owner@contoso.com",
+                }
+                for r in range(reports)
+            ],
+            "datasets": [
+                {
+                    "id": f"{workspace_id}-d{d}", "name": f"Model {d}", "configuredBy": "owner@contoso.com",
+                    "isRefreshable": True, "createdDate": "2024-01-01T00:00:00Z", "targetStorageMode": "Import",
+                }
+                for d in range(semantic_models)
+            ],
+            "users": [
+                {
+                    "emailAddress": f"user{u}@contoso.com", "displayName": f"User {u}",
+                    "groupUserAccessRight": "Admin" if u == 0 else "Viewer", "principalType": "User",
+                }
+                for u in range(users)
+            ],
+        })
+    return tenant
+
+
+def load(body: str, keep_original_data: bool) -> list:
+    """Decodes the JSON body of the tenant and builds its entities. The payloads are decoded inside the measured
+    window, like API responses, so the ones kept as original_data are counted."""
+    parent = _Parent(keep_original_data)
+    workspaces = []
+    for payload in json.loads(body):
+        workspace = Workspace(parent, payload)
+        workspace.load_scan_result(payload)
+        workspaces.append(workspace)
+    return workspaces
+
+
+def to_dict_layout(workspaces: list) -> list:
+    """Copies the entities to the previous __dict__ layout, keeping original_data."""
+
+    def copy(entity, parent):
+        legacy = _DictEntity()
+        legacy.__dict__.update({name: getattr(entity, name) for name in type(entity).__slots__ if not name.startswith("_")})
+        legacy.parent = parent
+        return legacy
+
+    legacy_workspaces = []
+    for workspace in workspaces:
+        legacy = copy(workspace, workspace.parent)
+        legacy.reports = {copy(report, legacy) for report in workspace.reports}
+        legacy.semantic_models = {copy(model, legacy) for model in workspace.semantic_models}
+        legacy.users = {copy(user, legacy) for user in workspace.users}
+        legacy_workspaces.append(legacy)
+    return legacy_workspaces
+
+
+def measure(build) -> int:
+    """Returns the bytes still allocated by the objects build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workspaces", type=int, default=2000)
+    parser.add_argument("--reports", type=int, default=50)
+    parser.add_argument("--semantic-models", type=int, default=40)
+    parser.add_argument("--users", type=int, default=10)
+    args = parser.parse_args()
+
+    body = json.dumps(synthetic_tenant(args.workspaces, args.reports, args.semantic_models, args.users))
+    entities = args.workspaces * (1 + args.reports + args.semantic_models + args.users)
+
+    results = {
+        "__dict__ + original_data (previous)": measure(lambda: to_dict_layout(load(body, keep_original_data=True))),
+        "__slots__ + original_data": measure(lambda: load(body, keep_original_data=True)),
+        "__slots__ without original_data": measure(lambda: load(body, keep_original_data=False)),
+    }
+
+    baseline = next(iter(results.values()))
+    print(f"{entities:,} entities in {args.workspaces:,} workspaces")
+    for layout, size in results.items():
+        print(f"{layout:<40} {size / 2 ** 20:>9.1f} MiB {size / entities:>7.0f} B/entity {size / baseline:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Decoding and entity building time of a scanner sized response.
+
+Decodes one admin/workspaces/scanResult body of a synthetic tenant with every installed JSON decoder, then builds
+the Workspace entities from the decoded payloads, given as is and expanded into keyword arguments as before. Run
+from the repository root:
+
+    python -m benchmarks.json_decoding --workspaces 100 --reports 200
+"""
+import argparse
+import json
+import time
+
+from src.APIBeacon.decoders import DECODERS
+from src.APIBeacon.report import Report
+from src.APIBeacon.semantic_model import SemanticModel
+from src.APIBeacon.user import User
+from src.APIBeacon.workspace import Workspace
+
+from .entity_memory import _Parent
+from .mock_server import SyntheticTenant
+
+
+def best_of(repeat: int, function) -> float:
+    """Returns the fastest of repeat runs of function, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def build(workspaces: list, expand_kwargs: bool) -> None:
+    parent = _Parent(keep_original_data=False)
+    for payload in workspaces:
+        if expand_kwargs:
+            workspace = Workspace(parent, **payload)
+            workspace.reports = {Report(workspace, **report) for report in payload["reports"]}
+            workspace.semantic_models = {SemanticModel(workspace, **model) for model in payload["datasets"]}
+            workspace.users = {User(workspace, **user) for user in payload["users"]}
+        else:
+            workspace = Workspace(parent, payload)
+            workspace.load_scan_result(payload)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workspaces", type=int, default=100, help="workspaces of the scan result, the API returns up to 100")
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--semantic-models", type=int, default=100)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tenant = SyntheticTenant(args.workspaces, args.reports, args.semantic_models, args.users, dashboards=0)
+    body = json.dumps({"workspaces": [tenant.scan_result(w) for w in range(args.workspaces)]}).encode("utf-8")
+    print(f"Body: {len(body) / 2 ** 20:.1f} MiB")
+
+    for name, decoder in DECODERS.items():
+        print(f"decode {name:>8}: {best_of(args.repeat, lambda: decoder(body)):.3f} s")
+
+    workspaces = json.loads(body)["workspaces"]
+    for label, expand_kwargs in (("payload", False), ("kwargs", True)):
+        print(f"build  {label:>8}: {best_of(args.repeat, lambda: build(workspaces, expand_kwargs)):.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Local stand-in for the Power BI REST API, serving a synthetic tenant.
+
+Emulates groups, groups/{id}, groups/{id}/reports|datasets|users|dashboards, apps and the admin scanner endpoints
+(workspaces/modified, getInfo, scanStatus, scanResult) under /v1.0/myorg/, with a configurable latency and 429
+injection. Ids are GUID shaped, so endpoint templates and lookups behave like against a real tenant. Run it
+standalone from the repository root to point other tools at it:
+
+    python -m benchmarks.mock_server --workspaces 1000 --latency 0.05 --port 8765
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+API_PREFIX = "/v1.0/myorg/"
+
+
+class SyntheticTenant:
+    """Deterministic tenant: every workspace has the same number of reports, semantic models, users and dashboards,
+    and its payloads are built on request instead of being kept in memory."""
+
+    def __init__(self, workspaces=100, reports=20, semantic_models=10, users=10, dashboards=5, apps=10) -> None:
+        self.workspaces = workspaces
+        self.reports = reports
+        self.semantic_models = semantic_models
+        self.users = users
+        self.dashboards = dashboards
+        self.apps = apps
+
+    @staticmethod
+    def _id(workspace: int, kind: int = 0, index: int = 0) -> str:
+        return f"{workspace:08x}-{kind:04x}-4000-8000-{index:012x}"
+
+    def workspace_index(self, workspace_id: str):
+        """Returns the index of a workspace id of this tenant, or None."""
+        try:
+            index = int(workspace_id[:8], 16)
+        except ValueError:
+            return None
+        return index if index < self.workspaces and workspace_id == self._id(index) else None
+
+    def workspace(self, w: int) -> dict:
+        return {
+            "id": self._id(w), "name": f"Workspace {w}", "isReadOnly": False,
+            "isOnDedicatedCapacity": w % 2 == 0, "capacityId": "00000000-0000-4000-8000-00000000ca9a" if w % 2 == 0 else None,
+        }
+
+    def workspace_reports(self, w: int) -> list:
+        workspace_id = self._id(w)
+        return [
+            {
+                "id": self._id(w, 1, r), "name": f"Report {r}", "datasetId": self._id(w, 2, r % max(self.semantic_models, 1)),
+                "reportType": "PowerBIReport", "webUrl": f"https://app.powerbi.com/groups/{workspace_id}/reports/{self._id(w, 1, r)}",
+                "embedUrl": f"https://app.powerbi.com/reportEmbed?reportId={self._id(w, 1, r)}&groupId={workspace_id}",
+                "createdBy": "owner@contoso.com", "modifiedBy": "owner@contoso.com",
+            }
+            for r in range(self.reports)
+        ]
+
+    def workspace_semantic_models(self, w: int) -> list:
+        return [
+            {
+                "id": self._id(w, 2, d), "name": f"Model {d}", "configuredBy": "owner@contoso.com", "isRefreshable": True,
+                "createdDate": "2024-01-01T00:00:00Z", "targetStorageMode": "Import",
+            }
+            for d in range(self.semantic_models)
+        ]
+
+    def workspace_users(self, w: int) -> list:
+        return [
+            {
+                "emailAddress": f"user{u}@contoso.com", "displayName": f"User {u}",
+                "groupUserAccessRight": "Admin" if u == 0 else "Member" if u == 1 else "Viewer", "principalType": "User",
+            }
+            for u in range(self.users)
+        ]
+
+    def workspace_dashboards(self, w: int) -> list:
+        return [
+            {"id": self._id(w, 3, d), "displayName": f"Dashboard {d}", "isReadOnly": False, "embedUrl": f"https://app.powerbi.com/dashboardEmbed?dashboardId={self._id(w, 3, d)}"}
+            for d in range(self.dashboards)
+        ]
+
+    def app_list(self) -> list:
+        return [
+            {"id": self._id(0, 4, a), "name": f"App {a}", "description": "", "publishedBy": "owner@contoso.com", "lastUpdate": "2024-01-01T00:00:00Z"}
+            for a in range(self.apps)
+        ]
+
+    def scan_result(self, w: int) -> dict:
+        return {
+            **self.workspace(w), "state": "Active", "type": "Workspace",
+            "reports": self.workspace_reports(w), "datasets": self.workspace_semantic_models(w),
+            "users": self.workspace_users(w), "dashboards": self.workspace_dashboards(w),
+        }
+
+
+def _page(items: list, query: dict) -> list:
+    """Applies the $skip and $top of the query string to a collection."""
+    skip = int(query.get("$skip", ["0"])[0])
+    top = query.get("$top")
+    return items[skip:skip + int(top[0])] if top else items[skip:]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "MockPowerBI/1.0"
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+
+    def log_message(self, format, *args) -> None:
+        return None
+
+    def _send(self, status: int, body=None, headers=None) -> None:
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self) -> None:
+        mock = self.server.mock
+        payload = self._read_json()  # Always consumed, the connection is kept alive
+        throttled = mock._count_request()
+        if mock.latency:
+            time.sleep(mock.latency)
+        if throttled:
+            return self._send(429, {"error": {"code": "TooManyRequests"}}, {"Retry-After": str(mock.retry_after)})
+
+        url = urlsplit(self.path)
+        if not url.path.startswith(API_PREFIX):
+            return self._send(404, {"error": {"code": "NotFound"}})
+        segments = url.path[len(API_PREFIX):].strip("/").split("/")
+        query = parse_qs(url.query)
+        status, body = mock.route(self.command, segments, query, payload)
+        self._send(status, body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def do_DELETE(self) -> None:
+        self._handle()
+
+
+class MockPowerBIServer:
+    """
+    #### Description:
+        Threaded HTTP server answering the Power BI REST endpoints used by the package from a SyntheticTenant.
+        Every request waits latency seconds, and every throttle_every-th request is answered 429 with a Retry-After.
+
+    #### Attributes:
+        tenant (SyntheticTenant): Tenant served.
+        latency (float): Seconds added to every request.
+        throttle_every (int): Answer one request out of throttle_every with 429, 0 to never throttle.
+        retry_after (float): Retry-After of the 429 responses, in seconds.
+        request_count (int): Number of requests received.
+        throttled_count (int): Number of requests answered 429.
+        base_url (str): URL to use as AbstractPbiAPI.BASE_URL once started.
+    """
+
+    def __init__(self, tenant=None, latency=0.0, throttle_every=0, retry_after=1, host="127.0.0.1", port=0) -> None:
+        self.tenant = tenant or SyntheticTenant()
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.throttled_count = 0
+        self._lock = threading.Lock()
+        self._scans = {}  # Workspace ids by scan id
+        self._scan_ids = itertools.count()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def start(self):
+        """Serves on a daemon thread and returns self."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-power-bi", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.request_count = 0
+            self.throttled_count = 0
+
+    def _count_request(self) -> bool:
+        """Counts a request and returns True if it must be throttled."""
+        with self._lock:
+            self.request_count += 1
+            throttled = bool(self.throttle_every) and self.request_count % self.throttle_every == 0
+            self.throttled_count += throttled
+            return throttled
+
+    def route(self, method: str, segments: list, query: dict, payload) -> tuple:
+        """Returns the (status, JSON body) answering a request, segments being the path under /v1.0/myorg/."""
+        tenant = self.tenant
+        if method == "GET" and segments == ["groups"]:
+            return 200, {"value": _page([tenant.workspace(w) for w in range(tenant.workspaces)], query)}
+        if method == "GET" and segments == ["apps"]:
+            return 200, {"value": tenant.app_list()}
+
+        if segments[0] == "groups" and len(segments) in (2, 3) and method == "GET":
+            w = tenant.workspace_index(segments[1])
+            if w is None:
+                return 404, {"error": {"code": "ItemNotFound"}}
+            if len(segments) == 2:
+                return 200, tenant.workspace(w)
+            collections = {
+                "reports": tenant.workspace_reports, "datasets": tenant.workspace_semantic_models,
+                "users": tenant.workspace_users, "dashboards": tenant.workspace_dashboards,
+            }
+            if segments[2] in collections:
+                return 200, {"value": _page(collections[segments[2]](w), query)}
+
+        if segments[:2] == ["admin", "workspaces"] and len(segments) >= 3:
+            if method == "GET" and segments[2] == "modified":
+                return 200, [{"id": tenant.workspace(w)["id"]} for w in range(tenant.workspaces)]
+            if method == "POST" and segments[2] == "getInfo":
+                scan_id = tenant._id(0, 5, next(self._scan_ids))
+                with self._lock:
+                    self._scans[scan_id] = list((payload or {}).get("workspaces", []))
+                return 202, {"id": scan_id, "createdDateTime": "2024-01-01T00:00:00Z", "status": "NotStarted"}
+            if len(segments) == 4 and segments[3] in self._scans:
+                if method == "GET" and segments[2] == "scanStatus":
+                    return 200, {"id": segments[3], "status": "Succeeded"}
+                if method == "GET" and segments[2] == "scanResult":
+                    with self._lock:
+                        workspace_ids = self._scans.pop(segments[3])
+                    indexes = (tenant.workspace_index(workspace_id) for workspace_id in workspace_ids)
+                    return 200, {"workspaces": [tenant.scan_result(w) for w in indexes if w is not None]}
+
+        return 404, {"error": {"code": "NotFound"}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workspaces", type=int, default=100)
+    parser.add_argument("--reports", type=int, default=20)
+    parser.add_argument("--semantic-models", type=int, default=10)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--dashboards", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--throttle-every", type=int, default=0, help="answer one request out of N with 429")
+    parser.add_argument("--retry-after", type=float, default=1)
+    args = parser.parse_args()
+
+    tenant = SyntheticTenant(args.workspaces, args.reports, args.semantic_models, args.users, args.dashboards)
+    server = MockPowerBIServer(tenant, args.latency, args.throttle_every, args.retry_after, args.host, args.port)
+    print(f"Serving {args.workspaces} workspaces on {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
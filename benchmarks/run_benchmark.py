@@ -0,0 +1,126 @@
+"""End-to-end benchmark of full Service inventories against the local mock server.
+
+Every scenario builds a fresh Service, authenticated with a StaticTokenCredential holding a fake JWT, and loads the
+whole synthetic tenant. Reports wall time, requests/sec, the requests answered 429 and the peak memory traced by
+tracemalloc. Run from the repository root, and keep the JSON output of a release to compare the next one with:
+
+    python -m benchmarks.run_benchmark --workspaces 500 --latency 0.02 --json results.json
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import jwt
+
+os.environ.setdefault("APPDATA", tempfile.gettempdir())  # Logs and caches go under APPDATA, only set on Windows
+
+from src.APIBeacon import Service
+from src.APIBeacon.api import AbstractPbiAPI
+from src.APIBeacon.async_api import AsyncPbiAPI
+from src.APIBeacon.credentials import StaticTokenCredential
+from src.APIBeacon.rate_limiter import RateLimiter
+
+from .mock_server import MockPowerBIServer, SyntheticTenant
+
+
+def fake_token() -> str:
+    """Returns a JWT with the claims the API object reads (upn, exp), signed with a throwaway key."""
+    return jwt.encode({"upn": "benchmark@contoso.com", "exp": int(time.time()) + 3600}, "benchmark-signing-key-of-32-bytes")
+
+
+def hydrate(service: Service, args) -> None:
+    service.get_workspaces()
+    service.hydrate_all(workers=args.workers)
+    service.get_apps()
+
+
+def hydrate_async(service: Service, args) -> None:
+    async def run():
+        async with AsyncPbiAPI(service.api, max_concurrency=args.workers) as async_api:
+            service.async_api = async_api
+            await service.hydrate_all_async()
+
+    service.get_workspaces()
+    asyncio.run(run())
+    service.get_apps()
+
+
+def scan(service: Service, args) -> None:
+    service.get_workspaces()
+    service.scan_workspaces(max_workers=args.workers, poll_interval=0.01)
+    service.get_apps()
+
+
+SCENARIOS = {"hydrate": hydrate, "hydrate_async": hydrate_async, "scan": scan}
+
+
+def run_scenario(name: str, server: MockPowerBIServer, args) -> dict:
+    service = Service(credential=StaticTokenCredential(fake_token(), tenant_id="benchmark", client_id=name))
+    service.api.rate_limiter = RateLimiter(max_rate=args.max_rate, burst=args.max_rate)
+    service.api.metrics.reset()
+    server.reset_counters()
+
+    gc.collect()
+    if args.memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    SCENARIOS[name](service, args)
+    wall = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] if args.memory else None
+    if args.memory:
+        tracemalloc.stop()
+
+    reports = sum(len(workspace.reports) for workspace in service.workspaces)
+    service.api.close()
+    return {
+        "scenario": name,
+        "workspaces": len(service.workspaces),
+        "reports": reports,
+        "wall_seconds": round(wall, 3),
+        "requests": server.request_count,
+        "requests_per_second": round(server.request_count / wall, 1) if wall else None,
+        "throttled": server.throttled_count,
+        "peak_memory_mib": round(peak / 2 ** 20, 1) if peak is not None else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument("--workspaces", type=int, default=200)
+    parser.add_argument("--reports", type=int, default=20)
+    parser.add_argument("--semantic-models", type=int, default=10)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--dashboards", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds added by the server to every request")
+    parser.add_argument("--throttle-every", type=int, default=0, help="answer one request out of N with 429")
+    parser.add_argument("--retry-after", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=16, help="threads, concurrent requests or concurrent scans")
+    parser.add_argument("--max-rate", type=float, default=1000, help="requests per second allowed by the rate limiter")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip tracemalloc, which slows the run down")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    tenant = SyntheticTenant(args.workspaces, args.reports, args.semantic_models, args.users, args.dashboards)
+    results = []
+    with MockPowerBIServer(tenant, args.latency, args.throttle_every, args.retry_after) as server:
+        AbstractPbiAPI.BASE_URL = server.base_url
+        for name in args.scenarios:
+            results.append(run_scenario(name, server, args))
+
+    columns = list(results[0])
+    print(" ".join(f"{column:>20}" for column in columns))
+    for result in results:
+        print(" ".join(f"{str(result[column]):>20}" for column in columns))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"arguments": vars(args), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
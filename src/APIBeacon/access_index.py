@@ -0,0 +1,80 @@
+from .workspace_index import WorkspaceIndex
+
+
+class AccessIndex(WorkspaceIndex):
+    """
+    #### Description:
+        Principal-centric index of the workspace users of a service: for every email, the workspaces it can reach
+        and its access right in each, without scanning the users of every workspace. Emails are matched case
+        insensitively. It is kept up to date as the users of the workspaces load, principals without an email are
+        left out.
+
+    #### Methods:
+        access_of (returns list): Returns the (workspace, access right) tuples of a principal.
+        with_access_right (returns list): Returns the (user, workspace) tuples with an access right, e.g. every Admin.
+        principals (returns set): Returns the emails of the indexed principals, optionally of one principal type.
+    """
+
+    COLLECTIONS = ("users",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._by_email = {}  # {workspace id: User} by lowercased email
+        self._by_access_right = {}  # {(lowercased email, workspace id): User} by access right
+
+    def _add(self, name: str, item) -> None:
+        if item.email is None:
+            return
+        email = item.email.lower()
+        self._by_email.setdefault(email, {})[item.parent.id] = item
+        self._by_access_right.setdefault(item.access_right, {})[(email, item.parent.id)] = item
+
+    def _remove(self, name: str, item) -> None:
+        if item.email is None:
+            return
+        email = item.email.lower()
+        for index, outer_key, inner_key in (
+            (self._by_email, email, item.parent.id),
+            (self._by_access_right, item.access_right, (email, item.parent.id)),
+        ):
+            entries = index.get(outer_key)
+            if entries is not None and entries.get(inner_key) is item:
+                del entries[inner_key]
+                if not entries:
+                    del index[outer_key]
+
+    def access_of(self, email: str) -> list:
+        """Returns what a principal can reach.
+
+        Args:
+            email (str): Email of the user, group or service principal, in any case.
+
+        Returns:
+            list: (Workspace, access right) tuples, empty if the principal isn't in any loaded workspace.
+        """
+        with self._lock:
+            return [(user.parent, user.access_right) for user in self._by_email.get(email.lower(), {}).values()]
+
+    def with_access_right(self, access_right: str, principal_type: str = None) -> list:
+        """Returns every principal with an access right across the loaded workspaces, e.g. all the Admins.
+
+        Args:
+            access_right (str): Access right (Admin, Member, Contributor, Viewer).
+            principal_type (str, optional): Only keep this principal type (User, Group, App). Defaults to None.
+
+        Returns:
+            list: (User, Workspace) tuples.
+        """
+        with self._lock:
+            users = list(self._by_access_right.get(access_right, {}).values())
+        return [(user, user.parent) for user in users if principal_type is None or user.principal_type == principal_type]
+
+    def principals(self, principal_type: str = None) -> set:
+        """Returns the lowercased emails of the indexed principals, optionally only the ones of a principal type."""
+        with self._lock:
+            if principal_type is None:
+                return set(self._by_email)
+            return {
+                email for email, users in self._by_email.items()
+                if any(user.principal_type == principal_type for user in users.values())
+            }
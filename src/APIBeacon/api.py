@@ -1,29 +1,70 @@
 import jwt
 import requests
 from azure.identity import InteractiveBrowserCredential
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError, RequestException, Timeout, TooManyRedirects
+import threading
 import time
 
 
 from .logger import Logger
 from .singleton import SingletonMeta
+from .rate_limiter import RateLimiter, parse_retry_after
+from .response_cache import ResponseCache
+from .disk_cache import DiskCache
+from .metrics import ApiMetrics, endpoint_template
+from .tracing import tracer
+from .decoders import DECODE_ERRORS, get_decoder
 from .api_custom_exceptions import APIError, InternalServerError, JSONDecodeError, TokenExpiredError, TooManyRequestsError, UnauthorizedError, PowerBIEntityNotFoundError
  
 class PbiAPI(metaclass=SingletonMeta):
     """
     #### Description:
-        Singleton instance of PBI rest API interface.
+        Singleton instance of PBI rest API interface, one per proxy and identity (tenant and client of the credential),
+        so one process can talk to several tenants while the threads of each one share its connection pool.
 
     ###Attributes:
         proxy_url (str): proxy URL to pass as an argument to API calls.
         saved_token (str): if there's still a valid token available (1h duration) use this argument.
+        pool_connections (int): number of connection pools kept by the HTTP session.
+        pool_maxsize (int): maximum number of keep-alive connections per pool.
+        rate_limiter (RateLimiter): rate limiter shared by every request, a default one is created if None.
+        token_cache (TokenCache): persistent cache of access tokens shared between processes, None to always authenticate.
+        credential (object): source of the access tokens (see credentials.py), None for the interactive browser login.
         _pbi_api (BasicPbiAPI): instance of BasicPbiAPI class
     """
 
-    def __init__(self, proxy_url=None, saved_token=None) -> None:
+    def __init__(self, proxy_url=None, saved_token=None, pool_connections=10, pool_maxsize=10, rate_limiter=None, token_cache=None, credential=None) -> None:
         self.proxy_url = proxy_url
         self.saved_token = saved_token
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.rate_limiter = rate_limiter
+        self.token_cache = token_cache
+        self.credential = credential
         self._pbi_api = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _singleton_key(cls, proxy_url=None, saved_token=None, pool_connections=10, pool_maxsize=10, rate_limiter=None, token_cache=None, credential=None):
+        """Returns the key of the instance in the SingletonMeta registry: the proxy and the identity of the credential,
+        or of the saved token when there is no credential."""
+        if credential is None and saved_token:
+            return (proxy_url, cls._token_identity(saved_token))
+        tenant_id = getattr(credential, "tenant_id", None)
+        client_id = getattr(credential, "client_id", None)
+        identity = (tenant_id, client_id) if tenant_id or client_id else credential  # Fall back to the credential object itself
+        return (proxy_url, identity)
+
+    @staticmethod
+    def _token_identity(token: str) -> tuple:
+        """Returns the (tenant, principal) of an access token from its tid and first principal claim (upn, appid, azp,
+        oid, sub), the token itself if it can't be decoded."""
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False, "verify_exp": False})
+        except jwt.exceptions.InvalidTokenError:
+            return (None, token)
+        return (claims.get("tid"), next((claims[claim] for claim in ("upn", "appid", "azp", "oid", "sub") if claims.get(claim)), None))
 
     @property
     def pbi_api(self):
@@ -33,9 +74,17 @@ class PbiAPI(metaclass=SingletonMeta):
             BasicPbiAPI: BasicPbiAPI instance.
         """
         if self._pbi_api is None:
-            self._pbi_api = AbstractPbiAPI(self.proxy_url, self.saved_token)
+            with self._lock:  # Only one thread authenticates, the others wait for its instance
+                if self._pbi_api is None:
+                    self._pbi_api = AbstractPbiAPI(self.proxy_url, self.saved_token, self.pool_connections, self.pool_maxsize, self.rate_limiter, self.token_cache, self.credential)
         return self._pbi_api
 
+    def close(self) -> None:
+        """Closes the underlying API session. A new one is created on the next access to pbi_api."""
+        if self._pbi_api is not None:
+            self._pbi_api.close()
+            self._pbi_api = None
+
 class AbstractPbiAPI:
     """
     #### Description:
@@ -45,40 +94,168 @@ class AbstractPbiAPI:
         BASE_URL (str): Base URL for Power BI API.
         logger (Logger): Logger object for logging.
         proxies (dict): Proxies for API requests.
-        user (str): User email from the access token.
+        user (str): User email from the access token, or the application id for a service principal.
         saved_token (str): Saved token for authentication.
         access_token (str): Access token for API requests.
-        header (dict): Header for API requests.
+        header (dict): Header for API requests, updated in place when the token is refreshed.
+        token_expires_on (float): Expiry of the access token, from the exp claim of the JWT, as a UNIX timestamp.
+        session (requests.Session): Pooled keep-alive session shared by all the API requests.
+        rate_limiter (RateLimiter): Rate limiter shared by all the API requests, slowed down globally on 429 responses.
+        token_cache (TokenCache): Persistent cache of access tokens shared between processes, None while disabled.
+        response_cache (ResponseCache): Opt-in cache of GET responses, None while disabled.
+        disk_cache (DiskCache): Opt-in on-disk store of GET responses revalidated with ETag/Last-Modified, None while disabled.
+        metrics (ApiMetrics): Latency, status, retry, size and throttling metrics of the requests, by endpoint template.
+        json_decoder (callable): Decoder of the response bodies, orjson or msgspec when installed, see decoders.get_decoder.
     
     #### Methods:
         __init__ (returns None): Initializes the BasicPbiAPI object.
+        close (returns None): Closes the pooled session and its connections.
+        enable_response_cache (returns ResponseCache): Starts caching GET responses in memory.
+        enable_disk_cache (returns DiskCache): Starts storing GET responses on disk and revalidating them.
         reauthenticate (returns str): Reauthenticates when the saved token expires.
         authenticate (returns None): Authenticates the user.
+        ensure_fresh_token (returns None): Refreshes the token if it is close to expiry, once for all the threads.
         __user_info (returns None): Gets the user email from the access token.
+        decode_json (returns dict): Decodes the JSON body of a response.
         make_api_get_request (returns dict or requests.models.Response): Makes a GET API request and handles potential errors.
         make_api_post_request (returns dict or requests.models.Response): Makes a POST API request and handles potential errors.
         make_api_delete_request (returns dict or requests.models.Response): Makes a DELETE API request and handles potential errors.
     """
     
     BASE_URL = "https://api.powerbi.com/v1.0/myorg/"
-
-    def __init__(self, proxy_url=None, saved_token=None) -> None:
+    AUTHORITY = "https://login.microsoftonline.com/"
+    SCOPE = "https://analysis.windows.net/powerbi/api/.default"
+    TOKEN_REFRESH_MARGIN = 300  # Seconds before the token expiry when it gets refreshed
+    TOKEN_REFRESH_RETRY = 30  # Seconds between two attempts of the background refresh when it fails
+
+    ERROR_HANDLERS = {
+        401: (UnauthorizedError, "Unauthorized"),
+        403: (TokenExpiredError, "Token expired"),
+        404: (PowerBIEntityNotFoundError, "Cannot find entity or remove the user"),
+        429: (TooManyRequestsError, "Too many requests"),
+        500: (InternalServerError, "Internal server error")
+    }
+
+    def __init__(self, proxy_url=None, saved_token=None, pool_connections=10, pool_maxsize=10, rate_limiter=None, token_cache=None, credential=None) -> None:
         """
         Args:
             proxy_url (str): proxy URL to pass as an argument to API calls.
             saved_token (str): if there's still a valid token available (1h duration) use this argument.
+            pool_connections (int): number of connection pools kept by the HTTP session. Defaults to 10.
+            pool_maxsize (int): maximum number of keep-alive connections per pool, should match the number of concurrent workers. Defaults to 10.
+            rate_limiter (RateLimiter): rate limiter shared by every request. Defaults to a new RateLimiter.
+            token_cache (TokenCache): persistent cache of access tokens, reused until near expiry instead of authenticating again. Defaults to None.
+            credential (object): any object with get_token(*scopes) returning an AccessToken, e.g. a ServicePrincipalCredential for headless workers. Defaults to the interactive browser login.
         """
         self.logger = Logger(__name__).get_logger()
         self.proxies = None
         self.user = None
         self.saved_token = saved_token
+        self.token_cache = token_cache
         if proxy_url:  # If proxy is set
             self.proxies = {
                 "http": proxy_url
                 ,"https": proxy_url
             }
 
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.response_cache = None
+        self.disk_cache = None
+        self.metrics = ApiMetrics()
+        self.json_decoder = get_decoder()
+        self.session = self._create_session(pool_connections, pool_maxsize)
+        self.header = {}
+        self.token_expires_on = None
+        self._credential = credential
+        self._auth_lock = threading.Lock()
+        self._next_refresh_attempt = 0.0  # No refresh before this UNIX timestamp, after one that didn't extend the token
+        self._saved_token_only = bool(saved_token) and credential is None  # Nothing to refresh it with but an interactive login
+        self._expiry_warned = False
+        self._stop_refresh = threading.Event()
         self.authenticate()
+        self._start_token_refresher()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _create_session(self, pool_connections, pool_maxsize) -> requests.Session:
+        """Creates the keep-alive session with the connection pool, proxies and default headers set once.
+
+        Args:
+            pool_connections (int): number of connection pools to cache.
+            pool_maxsize (int): maximum number of connections to keep per pool.
+
+        Returns:
+            requests.Session: the pooled session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        if self.proxies:
+            session.proxies.update(self.proxies)
+        return session
+
+    def close(self) -> None:
+        """Closes the pooled session and releases its connections, and stops the background token refresh."""
+        self._stop_refresh.set()
+        self.session.close()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+            self.disk_cache = None
+
+    def enable_response_cache(self, max_entries=1024, default_ttl=300, endpoint_ttls=None) -> ResponseCache:
+        """Starts caching GET responses in memory. POST and DELETE requests drop the cached responses they may have changed.
+
+        Args:
+            max_entries (int, optional): Maximum number of responses kept, the least recently used are evicted first. Defaults to 1024.
+            default_ttl (float, optional): Seconds a response is kept when no endpoint pattern matches. Defaults to 300.
+            endpoint_ttls (dict, optional): Seconds a response is kept by endpoint pattern relative to BASE_URL, e.g. {"groups/*/users*": 60}. Defaults to None.
+
+        Returns:
+            ResponseCache: The cache, also available as response_cache, with its hit/miss counters.
+        """
+        self.response_cache = ResponseCache(max_entries, default_ttl, endpoint_ttls)
+        return self.response_cache
+
+    def enable_disk_cache(self, directory=None, max_bytes=256 * 1024 * 1024) -> DiskCache:
+        """Starts storing GET responses on disk, so they survive restarts. Stored responses are revalidated with
+        If-None-Match/If-Modified-Since and reused when the API answers 304 Not Modified.
+
+        Args:
+            directory (str, optional): Directory of the SQLite file. Defaults to the cache folder next to the log folder.
+            max_bytes (int, optional): Maximum size of the stored bodies, least recently used evicted first. Defaults to 256 MB.
+
+        Returns:
+            DiskCache: The on-disk store, also available as disk_cache.
+        """
+        self.disk_cache = DiskCache(directory, max_bytes)
+        return self.disk_cache
+
+    def _response_from_disk(self, entry: dict) -> requests.Response:
+        """Rebuilds a 200 response from a response stored in disk_cache."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response.headers.update(entry["headers"])
+        response._content = entry["body"]
+        response.encoding = "utf-8"
+        return response
+
+    def _endpoint(self, url: str) -> str:
+        """Returns the path of url relative to BASE_URL, without query string."""
+        path = url.split("?", 1)[0]
+        return path[len(self.BASE_URL):] if path.startswith(self.BASE_URL) else path
+
+    def _invalidate_cache(self, url: str) -> None:
+        """Drops the cached responses of the collection changed by a POST or DELETE on url, and of everything under it."""
+        if self.response_cache is not None:
+            path = url.split("?", 1)[0].rstrip("/")
+            self.response_cache.invalidate(self.user, path.rsplit("/", 1)[0])
 
     def reauthenticate(self) -> str:
         """When the saved token expires, authenticates again.
@@ -87,28 +264,56 @@ class AbstractPbiAPI:
             str: new access token.
         """
         self.saved_token = None
-        self.authenticate()
+        self.authenticate(use_token_cache=False)
         return self.access_token
 
-    def authenticate(self):
-        """If there's no saved token, opens the InteractiveBrowserCredential for the user to authenticate. In case, there's a saved token, just creates the header"""
-        if not self.saved_token:
-            api = "https://analysis.windows.net/powerbi/api/.default"
-            auth = InteractiveBrowserCredential(authority="https://login.microsoftonline.com/")
-            access_token = auth.get_token(api)
-            self.access_token = access_token.token
-        else:
-            self.access_token = self.saved_token
+    def _token_cache_key(self) -> str:
+        if self._credential is None:
+            return f"{self.AUTHORITY}|{self.SCOPE}"
+        tenant_id = getattr(self._credential, "tenant_id", None)
+        client_id = getattr(self._credential, "client_id", None)
+        return f"{self.AUTHORITY}|{self.SCOPE}|{type(self._credential).__name__}|{tenant_id}|{client_id}"
 
-        self.header = {"Authorization": f"Bearer {self.access_token}"}
+    def authenticate(self, use_token_cache=True):
+        """If there's no saved token, reuses the token of the token cache or asks the credential for one, opening the InteractiveBrowserCredential for the user to authenticate when no credential was given. In case, there's a saved token, just creates the header
+
+        Args:
+            use_token_cache (bool, optional): Reuse the token of token_cache if it isn't close to expiry. Defaults to True.
+        """
+        with tracer.span("api.authenticate") as span:
+            source = "credential"
+            cached_token = None
+            if not self.saved_token and self.token_cache is not None and use_token_cache:
+                cached_token = self.token_cache.load(self._token_cache_key())
+
+            if self.saved_token:
+                self.access_token = self.saved_token
+                source = "saved_token"
+            elif cached_token:
+                self.access_token = cached_token
+                source = "token_cache"
+            else:
+                if self._credential is None:  # Kept to refresh the token silently later on
+                    self._credential = InteractiveBrowserCredential(authority=self.AUTHORITY)
+                with tracer.span("credential.get_token", credential=type(self._credential).__name__):
+                    access_token = self._credential.get_token(self.SCOPE)
+                self.access_token = access_token.token
+                if self.token_cache is not None:
+                    self.token_cache.save(self._token_cache_key(), self.access_token)
+            span.set_attribute("source", source)
+
+        self.header["Authorization"] = f"Bearer {self.access_token}"  # In place, callers may hold a reference to the header
+        self.session.headers.update(self.header)
 
         try:
             self.__user_info()
-        except (jwt.exceptions.ExpiredSignatureError, jwt.exceptions.DecodeError, jwt.exceptions.InvalidSignatureError, jwt.exceptions.InvalidTokenError):
-            self.logger.warning("Saved token has expired. Reauthenticating...")
-            self.reauthenticate()
-        except Exception:
-            self.logger.exception("Unexpected error during user info retrieval. Reauthenticating...")
+        except Exception as e:
+            if source == "credential":  # Asking the credential again would return the same token
+                raise APIError(f"The credential {type(self._credential).__name__} returned an unusable access token: {str(e)}") from e
+            if isinstance(e, jwt.exceptions.InvalidTokenError):
+                self.logger.warning(f"The token of the {source} has expired or is invalid. Reauthenticating...")
+            else:
+                self.logger.exception("Unexpected error during user info retrieval. Reauthenticating...")
             self.reauthenticate()
         
         
@@ -120,29 +325,179 @@ class AbstractPbiAPI:
             return decoded_token
 
         decoded_token = decode_token(self.access_token)
-        self.user = decoded_token["upn"]
+        # Service principal tokens have no upn, v2 ones carry azp instead of appid
+        self.user = next((decoded_token[claim] for claim in ("upn", "appid", "azp", "oid", "sub") if decoded_token.get(claim)), None)
+        self.token_expires_on = decoded_token.get("exp")
+
+    def token_needs_refresh(self) -> bool:
+        """Returns True when the access token expires within TOKEN_REFRESH_MARGIN seconds."""
+        return self.token_expires_on is not None and time.time() > self.token_expires_on - self.TOKEN_REFRESH_MARGIN
+
+    def _can_refresh(self) -> bool:
+        """Returns False for a saved token given without a credential: refreshing it would open an interactive login
+        in the middle of a run, the caller must give a credential to get it refreshed."""
+        return self._credential is not None or not self._saved_token_only
+
+    def _refresh_due(self) -> bool:
+        return self.token_needs_refresh() and self._can_refresh() and time.time() >= self._next_refresh_attempt
+
+    def token_expired(self) -> bool:
+        """Returns True once the access token has expired."""
+        return self.token_expires_on is not None and time.time() >= self.token_expires_on
+
+    def _request_waits_for_refresh(self) -> bool:
+        """Returns True when a request must wait for a token refresh, once the token has expired. Until then the
+        background thread refreshes it and the requests go on with the current token."""
+        return self.token_expired() and self._refresh_due()
+
+    def _check_token(self) -> None:
+        """Called before each request, refreshes an expired token or warns once that a saved token is about to expire."""
+        if self._request_waits_for_refresh():
+            self.ensure_fresh_token()
+        else:
+            self._warn_saved_token_expiry()
+
+    def _warn_saved_token_expiry(self) -> None:
+        if not self._can_refresh() and self.token_needs_refresh() and not self._expiry_warned:
+            self._expiry_warned = True
+            self.logger.warning(
+                f"The saved token expires at {time.ctime(self.token_expires_on)} and can't be refreshed. "
+                "Give a credential to refresh it silently."
+            )
+
+    def ensure_fresh_token(self) -> None:
+        """Refreshes the access token if it is close to expiry. Only one thread refreshes it, the others wait for the new token.
+        When the credential fails or can't return a newer token yet (a static token, or one cached with the same
+        expiry), the next attempt waits TOKEN_REFRESH_RETRY seconds instead of authenticating again on every request.
+
+        Raises:
+            Exception: The error of the credential, only once the current token has expired.
+        """
+        if not self._refresh_due():
+            return
+        with self._auth_lock:
+            if not self._refresh_due():  # Already refreshed by the thread holding the lock before
+                return
+            self.logger.info("Access token is close to expiry. Refreshing...")
+            self.saved_token = None
+            try:
+                self.authenticate()
+                if self.token_needs_refresh():  # The token cache only had the token being replaced
+                    self.authenticate(use_token_cache=False)
+            except Exception:
+                self._next_refresh_attempt = time.time() + self.TOKEN_REFRESH_RETRY
+                if self.token_expired():
+                    raise
+                self.logger.exception(f"Access token refresh failed, the current token is still valid. Retrying in {self.TOKEN_REFRESH_RETRY} seconds.")
+                return
+            if self.token_needs_refresh():
+                self._next_refresh_attempt = time.time() + self.TOKEN_REFRESH_RETRY
+                self.logger.warning(f"The credential returned no newer access token. Retrying in {self.TOKEN_REFRESH_RETRY} seconds.")
+
+    def _start_token_refresher(self) -> None:
+        """Starts a daemon thread refreshing the token TOKEN_REFRESH_MARGIN seconds before it expires."""
+        if self.token_expires_on is None or not self._can_refresh():
+            return
+        threading.Thread(target=self._refresh_token_loop, name="PbiAPI-token-refresh", daemon=True).start()
+
+    def _refresh_token_loop(self) -> None:
+        while True:
+            delay = max(self.TOKEN_REFRESH_RETRY, self.token_expires_on - self.TOKEN_REFRESH_MARGIN - time.time())
+            if self._stop_refresh.wait(delay):
+                return
+            try:
+                self.ensure_fresh_token()
+            except Exception:
+                self.logger.exception(f"Background token refresh failed. Retrying in {self.TOKEN_REFRESH_RETRY} seconds.")
     
     def _handle_response(self, response: requests.Response, url: str):
         
-        if response.status_code in [200, 201, 202]:
+        if response.status_code in [200, 201, 202, 304]:  # 304 only answers the conditional requests of disk_cache
             return response
-        
-        error_handlers = {
-            401: (UnauthorizedError, "Unauthorized"),
-            403: (TokenExpiredError, "Token expired"),
-            404: (PowerBIEntityNotFoundError, "Cannot find entity or remove the user"),
-            429: (TooManyRequestsError, "Too many requests"),
-            500: (InternalServerError, "Internal server error")
-        }
-
-        error_class, message = error_handlers.get(response.status_code, (APIError, "API error"))
+
+        error_class, message = self.ERROR_HANDLERS.get(response.status_code, (APIError, "API error"))
+        if error_class is TooManyRequestsError:
+            self.logger.warning(f"{message} {response.status_code} for {url}: {response.text}")
+            raise TooManyRequestsError(f"{message} {response.status_code}: {response.text}", retry_after=parse_retry_after(response.headers.get("Retry-After")))
         self.logger.error(f"{message} {response.status_code} for {url}: {response.text}")
         raise error_class(f"{message} {response.status_code}: {response.text}")
         
     def _log_retry_attempt(self, url, attempt, max_retries, exception):
         self.logger.error(f"Request timed out for {url}. Retry {attempt + 1} of {max_retries}. Exception: {exception}")
 
-    def make_api_get_request(self, url, headers=None, proxies=None, timeout_duration=10, max_retries=5):
+    def _throttle(self, url, attempt, max_retries, exception: TooManyRequestsError, sent_at: float = None) -> float:
+        """Holds every caller of the rate limiter for the Retry-After of the response, or an exponential backoff if the server didn't send one.
+        sent_at is the time.monotonic() the throttled request was sent at, so the 429s of one episode lower the rate once."""
+        delay = exception.retry_after if exception.retry_after is not None else 2 ** attempt
+        self.logger.warning(f"Throttled on {url}. Waiting {delay}s before retry {attempt + 1} of {max_retries}.")
+        return self.rate_limiter.throttle(delay, sent_at)  # The wait itself is recorded by the next acquire
+
+    def _send_request(self, method, url, headers=None, proxies=None, timeout_duration=10, max_retries=5, retry_on=(Timeout,), **kwargs):
+        """Sends a request through the pooled session and the rate limiter. Throttled requests wait for the Retry-After
+        of the response, the ones failing with the given exceptions are retried with exponential backoff.
+
+        Args:
+            method (str): HTTP verb of the request.
+            url (str): The API endpoint URL.
+            headers (dict, optional): the headers for the request. Defaults to the session headers.
+            proxies (dict, optional): the proxies for the request. Defaults to the session proxies.
+            timeout_duration (int, optional): The timeout duration for the request. Defaults to 10.
+            max_retries (int, optional): The maximum number of retries for the request. Defaults to 5.
+            retry_on (tuple, optional): Exceptions that trigger a retry. Defaults to (Timeout,).
+
+        Returns:
+            requests.models.Response: The response from the API.
+        """
+        endpoint = endpoint_template(self._endpoint(url))
+        for attempt in range(max_retries):
+            try:
+                with tracer.span("http.request", method=method, endpoint=endpoint, attempt=attempt) as span:
+                    self._check_token()
+                    self.rate_limiter.acquire(self.metrics.record_wait)
+                    sent_at = time.monotonic()
+                    started = time.perf_counter()
+                    response = self.session.request(method, url, headers=headers, proxies=proxies, timeout=timeout_duration, **kwargs)
+                    self.metrics.observe(method, endpoint, response.status_code, time.perf_counter() - started, len(response.content))
+                    span.set_attribute("status", response.status_code)
+                    self.logger.info(f"API {method}: Response from {url}: {response.status_code}")
+                    result = self._handle_response(response, url)
+                    self.rate_limiter.record_success()
+                    return result
+
+            except TooManyRequestsError as e:
+                self.metrics.record_retry(method, endpoint, "throttled")
+                self._throttle(url, attempt, max_retries, e, sent_at)
+
+            except retry_on as e:
+                self.metrics.record_retry(method, endpoint, "timeout")
+                self._log_retry_attempt(url, attempt, max_retries, e)
+                time.sleep(2 ** attempt)  # Exponential backoff
+
+            except (TooManyRedirects, HTTPError, RequestException) as e:
+                self.logger.error(f"Request error for {url}: {str(e)}")
+                raise APIError(f"Request error: {str(e)}") from e
+
+        raise APIError("API request failed after maximum retries.")
+
+    def decode_json(self, body):
+        """Decodes the JSON body of a response.
+
+        Args:
+            body (bytes or str): Body of the response, e.g. response.content.
+
+        Raises:
+            JSONDecodeError: When the body isn't valid JSON.
+
+        Returns:
+            dict or list: The decoded JSON.
+        """
+        with tracer.span("json.decode", bytes=len(body)):
+            try:
+                return self.json_decoder(body)
+            except DECODE_ERRORS as e:
+                raise JSONDecodeError(f"Invalid JSON in the response: {str(e)}") from e
+
+    def make_api_get_request(self, url, headers=None, proxies=None, timeout_duration=10, max_retries=5, use_cache=True):
         """Makes a GET API request and handles potential errors.
 
         Args:
@@ -152,34 +507,37 @@ class AbstractPbiAPI:
             timeout_duration (int, optional): The timeout duration for the request. Defaults to 10.
             max_retries (int, optional): The maximum number of retries for the request. Defaults to 3.
             json (bool, optional): If the response should be in JSON format. Defaults to True.
+            use_cache (bool, optional): Answer from response_cache and disk_cache when they are enabled. Defaults to True.
 
         Raises:
-            APIError: When the API request fails.
+            APIError: When the API request fails, or is still throttled (429) after max_retries.
             UnauthorizedError: When the API request fails with 401 status code.
             TokenExpiredError: When the API request fails with 403 status code.
-            TooManyRequestsError: When the API request fails with 429 status code.
             InternalServerError: When the API request fails with 500 status code.
 
         Returns:
             dict or requests.models.Response: The response from the API. 
         """
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, headers=headers, proxies=proxies, timeout=timeout_duration)
-                self.logger.info(f"API GET: Response from {url}: {response.status_code}")
-                return self._handle_response(response,url)
-
-            except Timeout as e:
-                self._log_retry_attempt(url, attempt, max_retries, e)
-                time.sleep(2 ** attempt)  # Exponential backoff
-
-            except (TooManyRedirects, HTTPError, RequestException) as e:
-                self.logger.error(f"Request error for {url}: {str(e)}")
-                raise APIError(f"Request error: {str(e)}") from e
-
-            
-
-        raise APIError("API request failed after maximum retries.")
+        with tracer.span("api.get", url=url):
+            if use_cache and self.response_cache is not None:
+                response = self.response_cache.get((self.user, url))
+                if response is not None:
+                    return response
+
+            stored = self.disk_cache.get(self.user, url) if use_cache and self.disk_cache is not None else None
+            if stored is not None:
+                headers = {**(headers or {}), **self.disk_cache.validators(stored)}
+
+            response = self._send_request("GET", url, headers=headers, proxies=proxies, timeout_duration=timeout_duration, max_retries=max_retries)
+            if stored is not None and response.status_code == 304:
+                self.disk_cache.touch(self.user, url)
+                response = self._response_from_disk(stored)
+            elif use_cache and self.disk_cache is not None:
+                self.disk_cache.store(self.user, url, response)
+
+            if use_cache and self.response_cache is not None:
+                self.response_cache.set((self.user, url), self._endpoint(url), response)
+            return response
 
     def make_api_post_request(self, url, headers=None, proxies=None, timeout_duration=10, max_retries=5, payload=None):
         """
@@ -203,24 +561,10 @@ class AbstractPbiAPI:
         - Timeout: If the request times out.
         - RequestException: For other types of requests exceptions.
         """
-        
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(url, headers=headers, proxies=proxies, timeout=timeout_duration, json=payload)
-                self.logger.info(f"API POST: Response from {url}: {response.status_code}")
-                return self._handle_response(response,url)
-
-            except (Timeout,TooManyRequestsError) as e:
-                self.logger.error(f"Request timed out for {url}. Retry {attempt + 1} of {max_retries}. Exception: {e}")
-                self._log_retry_attempt(url, attempt, max_retries, e)
-                time.sleep(2 ** attempt)  # Exponential backoff
-
-            except (TooManyRedirects, HTTPError, RequestException) as e:
-                self.logger.error(f"Request error for {url}: {str(e)}")
-                raise APIError(f"Request error: {str(e)}") from e
-
-            
-        raise APIError("API request failed after maximum retries.")
+        with tracer.span("api.post", url=url):
+            response = self._send_request("POST", url, headers=headers, proxies=proxies, timeout_duration=timeout_duration, max_retries=max_retries, json=payload)
+            self._invalidate_cache(url)
+            return response
     
     def make_api_delete_request(self, url, headers=None, proxies=None, timeout_duration=10, max_retries=5):
         """
@@ -240,20 +584,7 @@ class AbstractPbiAPI:
         Raises:
         - APIError: For any issues related to the API request.
         """
-        for attempt in range(max_retries):
-            try:
-                response = requests.delete(url, headers=headers, proxies=proxies, timeout=timeout_duration)
-                self.logger.info(f"API DELETE: Response from {url}: {response.status_code}")
-                return self._handle_response(response, url)
-
-            except Timeout as e:
-                self._log_retry_attempt(url, attempt, max_retries, e)
-                time.sleep(2 ** attempt)  # Exponential backoff
-
-            except (TooManyRedirects, HTTPError, RequestException) as e:
-                self.logger.error(f"Request error for {url}: {str(e)}")
-                raise APIError(f"Request error: {str(e)}") from e
-
-
-        raise APIError("API request failed after maximum retries.")
-        
+        with tracer.span("api.delete", url=url):
+            response = self._send_request("DELETE", url, headers=headers, proxies=proxies, timeout_duration=timeout_duration, max_retries=max_retries)
+            self._invalidate_cache(url)
+            return response
@@ -8,7 +8,17 @@ class TokenExpiredError(Exception):
     """Raised when the token has expired."""
 
 class TooManyRequestsError(Exception):
-    """Too many requests sent in a short period of time."""
+    """Too many requests sent in a short period of time.
+
+    Attributes:
+        retry_after (float): seconds the server asked to wait before retrying, None if it didn't say
+        message (str): explanation of the error
+    """
+
+    def __init__(self, message="Too many requests.", retry_after=None):
+        self.message = message
+        self.retry_after = retry_after
+        super().__init__(self.message)
 
 class InternalServerError(Exception):
     """Internal server error."""
@@ -26,4 +36,17 @@ class PowerBIEntityNotFoundError(Exception):
 
     def __init__(self, message="Entity not found."):
         self.message = message
-        super().__init__(self.message)
\ No newline at end of file
+        super().__init__(self.message)
+
+class SnapshotVersionError(Exception):
+    """Raised when a snapshot was written with another schema version than the one of this package.
+
+    Attributes:
+        version (int): schema version of the snapshot, None if it has none
+        message (str): explanation of the error
+    """
+
+    def __init__(self, version=None, message=None):
+        self.version = version
+        self.message = message or f"Snapshot schema version {version} is not supported."
+        super().__init__(self.message)
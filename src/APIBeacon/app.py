@@ -1,6 +1,9 @@
 class App:
-    def __init__(self, service: object, **kwargs) -> None:
-        self.original_data = kwargs
+    __slots__ = ("original_data", "service", "id", "description", "name", "published_by", "last_update")
+
+    def __init__(self, service: object, data: dict = None, **kwargs) -> None:
+        kwargs = kwargs if data is None else data  # An API payload given as is isn't copied into keyword arguments
+        self.original_data = kwargs if service.context.keep_original_data else None
         self.service = service
 
         self.id = kwargs.get("id")
@@ -0,0 +1,221 @@
+import asyncio
+import time
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is only required by the async client
+    aiohttp = None
+
+from .logger import Logger
+from .api_custom_exceptions import APIError, TooManyRequestsError
+from .rate_limiter import parse_retry_after
+from .metrics import endpoint_template
+from .tracing import tracer
+
+
+class AsyncPbiAPI:
+    """
+    #### Description:
+        asyncio twin of AbstractPbiAPI. It reuses the authentication, proxies and header of a blocking AbstractPbiAPI
+        and sends the requests through a shared aiohttp session. A semaphore bounds the number of requests in flight.
+        The session and the semaphore belong to the event loop they were created on, they are created again when the
+        object is used from a new event loop, e.g. by a later asyncio.run.
+
+    #### Attributes:
+        api (AbstractPbiAPI): blocking API object that owns the access token.
+        max_concurrency (int): maximum number of requests in flight at the same time.
+        BASE_URL (str): Base URL for Power BI API.
+        logger (Logger): Logger object for logging.
+
+    #### Methods:
+        make_api_get_request (returns dict): Makes a GET API request and returns the decoded JSON.
+        make_api_post_request (returns dict or None): Makes a POST API request and returns the decoded JSON, if any.
+        make_api_delete_request (returns dict or None): Makes a DELETE API request and returns the decoded JSON, if any.
+        close (returns None): Closes the aiohttp session.
+    """
+
+    def __init__(self, api, max_concurrency=100) -> None:
+        """
+        Args:
+            api (AbstractPbiAPI): blocking API object that owns the access token.
+            max_concurrency (int, optional): maximum number of requests in flight at the same time. Defaults to 100.
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncPbiAPI. Install it with 'pip install aiohttp'.")
+
+        self.api = api
+        self.max_concurrency = max_concurrency
+        self.BASE_URL = api.BASE_URL
+        self.logger = Logger(__name__).get_logger()
+        self._semaphore = None
+        self._session = None
+        self._loop = None  # Event loop of the session and the semaphore
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _get_session(self):
+        """Creates the aiohttp session lazily, as it must be bound to the running event loop. A session left by another
+        event loop is dropped first."""
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._loop is not loop:
+            await self._drop_session()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector, headers={"Connection": "keep-alive"})
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._session
+
+    async def _drop_session(self) -> None:
+        """Forgets the session of a previous event loop. Once that loop is closed, its connections are already gone
+        and the session is only marked closed, it can't be awaited from the running loop."""
+        session, self._session = self._session, None
+        if session.closed:
+            return
+        if self._loop.is_closed():
+            connector = session.connector
+            session.detach()
+            await connector.close()  # Returns at once, the connector doesn't touch a closed loop
+        else:
+            self.logger.warning("AsyncPbiAPI used from a new event loop while the previous one still runs, its session is left open.")
+
+    async def close(self) -> None:
+        """Closes the aiohttp session and releases its connections."""
+        if self._session is not None and not self._session.closed:
+            if self._loop is asyncio.get_running_loop():
+                await self._session.close()
+            else:
+                await self._drop_session()
+        self._session = None
+        self._loop = None
+
+    def _handle_response(self, status: int, body: bytes, url: str, retry_after: str = None):
+        """Returns the decoded JSON body of a successful response or raises the same errors as AbstractPbiAPI."""
+        if status in [200, 201, 202]:
+            return self.api.decode_json(body) if body else None
+
+        text = body.decode("utf-8", errors="replace")
+
+        error_class, message = self.api.ERROR_HANDLERS.get(status, (APIError, "API error"))
+        if error_class is TooManyRequestsError:
+            self.logger.warning(f"{message} {status} for {url}: {text}")
+            raise TooManyRequestsError(f"{message} {status}: {text}", retry_after=parse_retry_after(retry_after))
+        self.logger.error(f"{message} {status} for {url}: {text}")
+        raise error_class(f"{message} {status}: {text}")
+
+    async def _send_request(self, method, url, headers=None, timeout_duration=10, max_retries=5, retry_on=(asyncio.TimeoutError,), **kwargs):
+        """Sends a request through the shared session and the rate limiter of the blocking API, so throttling slows
+        down threads and tasks alike. Throttled requests wait for the Retry-After of the response, the ones failing
+        with the given exceptions are retried with exponential backoff.
+
+        Args:
+            method (str): HTTP verb of the request.
+            url (str): The API endpoint URL.
+            headers (dict, optional): the headers for the request. Defaults to the header of the blocking API.
+            timeout_duration (int, optional): The timeout duration for the request. Defaults to 10.
+            max_retries (int, optional): The maximum number of retries for the request. Defaults to 5.
+            retry_on (tuple, optional): Exceptions that trigger a retry. Defaults to (asyncio.TimeoutError,).
+
+        Returns:
+            dict or None: The decoded JSON response from the API.
+        """
+        session = await self._get_session()
+        proxy = self.api.proxies.get("https") if self.api.proxies else None
+        timeout = aiohttp.ClientTimeout(total=timeout_duration)
+
+        metrics = self.api.metrics
+        endpoint = endpoint_template(self.api._endpoint(url))
+        for attempt in range(max_retries):
+            try:
+                if self.api._request_waits_for_refresh():  # Checked here, so the event loop only hands the refresh to a thread when due
+                    await asyncio.to_thread(self.api.ensure_fresh_token)
+                else:
+                    self.api._warn_saved_token_expiry()
+                async with self._semaphore:
+                    with tracer.span("http.request", method=method, endpoint=endpoint, attempt=attempt) as span:
+                        await self.api.rate_limiter.acquire_async(metrics.record_wait)
+                        sent_at = time.monotonic()
+                        started = time.perf_counter()
+                        async with session.request(method, url, headers=headers or self.api.header, proxy=proxy, timeout=timeout, **kwargs) as response:
+                            body = await response.read()
+                        metrics.observe(method, endpoint, response.status, time.perf_counter() - started, len(body))
+                        span.set_attribute("status", response.status)
+                self.logger.info(f"API {method}: Response from {url}: {response.status}")
+                result = self._handle_response(response.status, body, url, response.headers.get("Retry-After"))
+                self.api.rate_limiter.record_success()
+                return result
+
+            except TooManyRequestsError as e:
+                metrics.record_retry(method, endpoint, "throttled")
+                self.api._throttle(url, attempt, max_retries, e, sent_at)
+
+            except retry_on as e:
+                metrics.record_retry(method, endpoint, "timeout")
+                self.api._log_retry_attempt(url, attempt, max_retries, e)
+                await asyncio.sleep(2 ** attempt)  # Exponential backoff
+
+            except aiohttp.ClientError as e:
+                self.logger.error(f"Request error for {url}: {str(e)}")
+                raise APIError(f"Request error: {str(e)}") from e
+
+        raise APIError("API request failed after maximum retries.")
+
+    async def make_api_get_request(self, url, headers=None, timeout_duration=10, max_retries=5):
+        """Makes a GET API request and handles potential errors.
+
+        Args:
+            url (str): The API endpoint URL.
+            headers (dict, optional): the headers for the request. Defaults to None.
+            timeout_duration (int, optional): The timeout duration for the request. Defaults to 10.
+            max_retries (int, optional): The maximum number of retries for the request. Defaults to 5.
+
+        Raises:
+            APIError: When the API request fails, or is still throttled (429) after max_retries.
+            UnauthorizedError: When the API request fails with 401 status code.
+            TokenExpiredError: When the API request fails with 403 status code.
+            InternalServerError: When the API request fails with 500 status code.
+
+        Returns:
+            dict: The decoded JSON response from the API.
+        """
+        with tracer.span("async_api.get", url=url):
+            return await self._send_request("GET", url, headers=headers, timeout_duration=timeout_duration, max_retries=max_retries)
+
+    async def make_api_post_request(self, url, headers=None, timeout_duration=10, max_retries=5, payload=None):
+        """Makes a POST API request and handles potential errors.
+
+        Args:
+            url (str): The API endpoint URL.
+            headers (dict, optional): the headers for the request. Defaults to None.
+            timeout_duration (int, optional): The timeout duration for the request. Defaults to 10.
+            max_retries (int, optional): The maximum number of retries for the request. Defaults to 5.
+            payload (dict, optional): JSON body of the request. Defaults to None.
+
+        Returns:
+            dict or None: The decoded JSON response from the API.
+        """
+        with tracer.span("async_api.post", url=url):
+            result = await self._send_request("POST", url, headers=headers, timeout_duration=timeout_duration, max_retries=max_retries, json=payload)
+            self.api._invalidate_cache(url)  # The response cache of the blocking API is shared
+            return result
+
+    async def make_api_delete_request(self, url, headers=None, timeout_duration=10, max_retries=5):
+        """Makes a DELETE API request and handles potential errors.
+
+        Args:
+            url (str): The API endpoint URL.
+            headers (dict, optional): the headers for the request. Defaults to None.
+            timeout_duration (int, optional): The timeout duration for the request. Defaults to 10.
+            max_retries (int, optional): The maximum number of retries for the request. Defaults to 5.
+
+        Returns:
+            dict or None: The decoded JSON response from the API.
+        """
+        with tracer.span("async_api.delete", url=url):
+            result = await self._send_request("DELETE", url, headers=headers, timeout_duration=timeout_duration, max_retries=max_retries)
+            self.api._invalidate_cache(url)
+            return result
@@ -0,0 +1,57 @@
+class IndexedCollection:
+    """
+    #### Description:
+        Descriptor for the object sets of Service and Workspace. Assigning a set to the attribute rebuilds
+        dictionaries keyed on the given attributes of its items, so lookups are dictionary hits instead of scans.
+        The collections are refreshed by assigning a new set, changing the set in place leaves the indexes stale.
+        After each assignment the owner's _collection_changed(name, items) method is called, if it has one, so
+        indexes spanning several objects (lineage, access) can follow.
+
+    #### Attributes:
+        keys (tuple): Attributes of the items the collection is indexed on.
+
+    #### Methods:
+        lookup (returns object): Returns the item of an instance's collection with the given key value, or None.
+    """
+
+    def __init__(self, *keys) -> None:
+        self.keys = keys
+
+    def __set_name__(self, owner, name) -> None:
+        self.name = name
+        self.storage_name = f"_{name}"
+        self.index_name = f"_{name}_index"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(instance, self.storage_name)
+
+    def __set__(self, instance, value) -> None:
+        value = set(value)
+        index = {key: {} for key in self.keys}
+        for item in value:
+            for key, items_by_key in index.items():
+                key_value = getattr(item, key)
+                if key_value is not None:
+                    items_by_key[key_value] = item
+
+        setattr(instance, self.storage_name, value)
+        setattr(instance, self.index_name, index)
+
+        collection_changed = getattr(instance, "_collection_changed", None)
+        if collection_changed is not None:
+            collection_changed(self.name, value)
+
+    def lookup(self, instance, key: str, value):
+        """Returns the item of the instance's collection whose key attribute equals value.
+
+        Args:
+            instance (object): Object owning the collection.
+            key (str): Attribute the collection is indexed on.
+            value (object): Value looked up.
+
+        Returns:
+            object: The matching item, or None if there is none.
+        """
+        return getattr(instance, self.index_name)[key].get(value)
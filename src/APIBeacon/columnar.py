@@ -0,0 +1,126 @@
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is only required by the columnar export
+    pa = None
+
+
+# Columns of every inventory table as (column, attribute of the entity, key in the API payload, pyarrow type factory).
+# Child tables start with the workspace_id foreign key, filled from the parent workspace instead of an entity attribute.
+TABLES = {
+    "workspaces": (
+        ("id", "id", "id", "string"),
+        ("name", "name", "name", "string"),
+        ("is_read_only", "is_read_only", "isReadOnly", "bool_"),
+        ("is_on_dedicated_capacity", "is_on_dedicated_capacity", "isOnDedicatedCapacity", "bool_"),
+        ("capacity_id", "capacity_id", "capacityId", "string"),
+        ("state", "state", "state", "string"),
+    ),
+    "reports": (
+        ("workspace_id", None, None, "string"),
+        ("id", "id", "id", "string"),
+        ("name", "name", "name", "string"),
+        ("dataset_id", "dataset_id", "datasetId", "string"),
+        ("app_id", "app_id", "appId", "string"),
+        ("type", "type", "reportType", "string"),
+        ("description", "description", "description", "string"),
+        ("original_report_id", "original_report_id", "originalReportId", "string"),
+        ("web_url", "web_url", "webUrl", "string"),
+        ("embed_url", "embed_url", "embedUrl", "string"),
+        ("created_by", "created_by", "createdBy", "string"),
+        ("modified_by", "modified_by", "modifiedBy", "string"),
+    ),
+    "semantic_models": (
+        ("workspace_id", None, None, "string"),
+        ("id", "id", "id", "string"),
+        ("name", "name", "name", "string"),
+        ("configured_by", "configured_by", "configuredBy", "string"),
+        ("is_refreshable", "is_refreshable", "isRefreshable", "bool_"),
+        ("created_date", "created_date", "createdDate", "string"),
+        ("storage_mode", "storage_mode", "targetStorageMode", "string"),
+    ),
+    "users": (
+        ("workspace_id", None, None, "string"),
+        ("email", "email", "emailAddress", "string"),
+        ("name", "name", "displayName", "string"),
+        ("access_right", "access_right", "groupUserAccessRight", "string"),
+        ("principal_type", "principal_type", "principalType", "string"),
+    ),
+    "dashboards": (
+        ("workspace_id", None, None, "string"),
+        ("id", "id", "id", "string"),
+        ("name", "name", "displayName", "string"),
+        ("is_read_only", "is_read_only", "isReadOnly", "bool_"),
+        ("embed_url", "embed_url", "embedUrl", "string"),
+    ),
+    "apps": (
+        ("id", "id", "id", "string"),
+        ("name", "name", "name", "string"),
+        ("description", "description", "description", "string"),
+        ("published_by", "published_by", "publishedBy", "string"),
+        ("last_update", "last_update", "lastUpdate", "string"),
+    ),
+}
+
+WORKSPACE_CHILDREN = ("reports", "semantic_models", "users", "dashboards")
+
+
+def _append(columns: dict, spec: tuple, entity, workspace_id=None) -> None:
+    for column, attribute, _, _ in spec:
+        columns[column].append(workspace_id if attribute is None else getattr(entity, attribute))
+
+
+def inventory_columns(service) -> dict:
+    """Walks the object graph of a service once and returns its inventory column by column.
+
+    Args:
+        service (Service): Service with the workspaces and apps to export.
+
+    Returns:
+        dict: {table: {column: list of values}} for every table of TABLES.
+    """
+    tables = {table: {column: [] for column, _, _, _ in spec} for table, spec in TABLES.items()}
+    for workspace in service.workspaces:
+        _append(tables["workspaces"], TABLES["workspaces"], workspace)
+        for table in WORKSPACE_CHILDREN:
+            for entity in getattr(workspace, table):
+                _append(tables[table], TABLES[table], entity, workspace.id)
+    for app in service.apps:
+        _append(tables["apps"], TABLES["apps"], app)
+    return tables
+
+
+def schema(table: str):
+    """Returns the pyarrow schema of an inventory table."""
+    return pa.schema([(column, getattr(pa, type_name)()) for column, _, _, type_name in TABLES[table]])
+
+
+def to_arrow(service) -> dict:
+    """Returns the inventory of a service as pyarrow tables.
+
+    Args:
+        service (Service): Service with the workspaces and apps to export.
+
+    Raises:
+        ImportError: Case pyarrow isn't installed.
+
+    Returns:
+        dict: pyarrow.Table by table name (workspaces, reports, semantic_models, users, dashboards, apps).
+    """
+    if pa is None:
+        raise ImportError("The columnar export requires pyarrow: pip install pyarrow")
+    return {
+        table: pa.Table.from_pydict(columns, schema=schema(table))
+        for table, columns in inventory_columns(service).items()
+    }
+
+
+def to_pandas(service) -> dict:
+    """Returns the inventory of a service as pandas DataFrames, converted from the pyarrow tables.
+
+    Raises:
+        ImportError: Case pyarrow or pandas isn't installed.
+
+    Returns:
+        dict: pandas.DataFrame by table name.
+    """
+    return {table: arrow_table.to_pandas() for table, arrow_table in to_arrow(service).items()}
@@ -0,0 +1,53 @@
+from .async_api import AsyncPbiAPI
+from .lineage import LineageIndex
+from .access_index import AccessIndex
+
+
+class ClientContext:
+    """
+    #### Description:
+        Client state shared by a Service and every entity built under it. Entities reach the API and the logger
+        through their parent's context instead of resolving the PbiAPI and Logger singletons for each object,
+        which also keeps every entity on the client of its own tenant when several are used.
+
+    #### Attributes:
+        api (AbstractPbiAPI): Blocking API object.
+        logger (Logger): Logger object for logging.
+        async_api (AsyncPbiAPI): asyncio API object sharing the authentication of api, created on first use.
+        keep_original_data (bool): Keep the raw JSON payload of each entity in its original_data, None otherwise.
+        lineage (LineageIndex): Reports and semantic models of the service's workspaces, indexed both ways.
+        access (AccessIndex): Workspaces and access rights of the service's workspace users, by email.
+    """
+
+    def __init__(self, api, logger, keep_original_data=True) -> None:
+        self.api = api
+        self.logger = logger
+        self.keep_original_data = keep_original_data
+        self.lineage = LineageIndex()
+        self.access = AccessIndex()
+        self._async_api = None
+
+    @property
+    def async_api(self) -> AsyncPbiAPI:
+        if self._async_api is None:
+            self._async_api = AsyncPbiAPI(self.api)
+        return self._async_api
+
+    @async_api.setter
+    def async_api(self, async_api: AsyncPbiAPI) -> None:
+        self._async_api = async_api
+
+    async def close_async(self) -> None:
+        """Closes the session of the asyncio API object, if it was created."""
+        if self._async_api is not None:
+            await self._async_api.close()
+
+    def workspaces_changed(self, workspaces: set) -> None:
+        """Called by Service when its workspaces are assigned, so the indexes follow them."""
+        self.lineage.set_workspaces(workspaces)
+        self.access.set_workspaces(workspaces)
+
+    def collection_changed(self, workspace, name: str, items: set) -> None:
+        """Called by Workspace when one of its collections is assigned, so the indexes follow it."""
+        self.lineage.collection_changed(workspace, name, items)
+        self.access.collection_changed(workspace, name, items)
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+
+import jwt
+from azure.core.credentials import AccessToken
+from azure.identity import CertificateCredential, ClientSecretCredential, CredentialUnavailableError
+
+
+class CallableCredential:
+    """
+    #### Description:
+        Credential getting its access tokens from a callable, e.g. a secret store or a token broker of the platform.
+        Tokens are cached in the process and the callable is only called again refresh_margin seconds before expiry.
+        Any object with the same get_token method can be given to PbiAPI as credential.
+
+    #### Attributes:
+        token_provider (callable): Called as token_provider(*scopes), returns an access token (str) or an AccessToken.
+        refresh_margin (float): Seconds before expiry after which a cached token is replaced.
+        tenant_id (str): Tenant of the tokens, if known.
+        client_id (str): Identity of the tokens, if known.
+    """
+
+    def __init__(self, token_provider, refresh_margin=300, tenant_id=None, client_id=None) -> None:
+        self.token_provider = token_provider
+        self.refresh_margin = refresh_margin
+        self.tenant_id = tenant_id
+        self.client_id = client_id
+        self._lock = threading.Lock()
+        self._tokens = {}  # AccessToken by scopes
+
+    def _to_access_token(self, token) -> AccessToken:
+        if isinstance(token, AccessToken):
+            return token
+        return AccessToken(token, jwt.decode(token, options={"verify_signature": False})["exp"])
+
+    def get_token(self, *scopes, **kwargs) -> AccessToken:
+        """Returns the cached token of the scopes, or a new one from token_provider if it is close to expiry.
+
+        Returns:
+            AccessToken: The access token and its expiry as a UNIX timestamp.
+        """
+        with self._lock:
+            token = self._tokens.get(scopes)
+            if token is None or token.expires_on - self.refresh_margin <= time.time():
+                token = self._tokens[scopes] = self._to_access_token(self.token_provider(*scopes))
+            return token
+
+
+class StaticTokenCredential(CallableCredential):
+    """
+    #### Description:
+        Credential always returning the same access token. Meant for local tests and stub tenants, where the token
+        doesn't need to be valid for Azure AD but must still be a JWT with an exp claim.
+    """
+
+    def __init__(self, access_token: str, tenant_id=None, client_id=None) -> None:
+        super().__init__(lambda *scopes: access_token, refresh_margin=0, tenant_id=tenant_id, client_id=client_id)
+
+
+class EnvironmentTokenCredential(CallableCredential):
+    """
+    #### Description:
+        Credential reading an access token from an environment variable, for workers that are handed a token by
+        their scheduler. The variable is read again once the cached token is close to expiry.
+
+    #### Attributes:
+        variable (str): Name of the environment variable holding the token.
+    """
+
+    def __init__(self, variable="PBI_ACCESS_TOKEN", refresh_margin=300) -> None:
+        self.variable = variable
+        super().__init__(self._read_token, refresh_margin=refresh_margin)
+
+    def _read_token(self, *scopes) -> str:
+        token = os.environ.get(self.variable)
+        if not token:
+            raise CredentialUnavailableError(f"Environment variable {self.variable} is not set.")
+        return token
+
+
+class ServicePrincipalCredential:
+    """
+    #### Description:
+        Credential of an Azure AD app registration (service principal), authenticating with a client secret or a
+        certificate without any user interaction. Tokens are cached in the process by the underlying azure-identity
+        credential. The service principal must be allowed to use the Power BI APIs in the tenant settings.
+
+    #### Attributes:
+        tenant_id (str): Tenant of the app registration.
+        client_id (str): Application (client) id of the app registration.
+    """
+
+    def __init__(self, tenant_id: str, client_id: str, client_secret: str = None, certificate_path: str = None, certificate_password: str = None) -> None:
+        """
+        Args:
+            tenant_id (str): Tenant of the app registration.
+            client_id (str): Application (client) id of the app registration.
+            client_secret (str, optional): Client secret. Defaults to None.
+            certificate_path (str, optional): Path of a PEM or PKCS12 certificate, used when there's no client_secret. Defaults to None.
+            certificate_password (str, optional): Password of the certificate. Defaults to None.
+
+        Raises:
+            ValueError: Case neither client_secret nor certificate_path is given.
+        """
+        self.tenant_id = tenant_id
+        self.client_id = client_id
+        if client_secret:
+            self._credential = ClientSecretCredential(tenant_id, client_id, client_secret)
+        elif certificate_path:
+            self._credential = CertificateCredential(tenant_id, client_id, certificate_path, password=certificate_password)
+        else:
+            raise ValueError("A service principal needs a client_secret or a certificate_path.")
+
+    def get_token(self, *scopes, **kwargs) -> AccessToken:
+        """Returns an access token for the scopes, from the in-process cache when it is still valid."""
+        return self._credential.get_token(*scopes, **kwargs)
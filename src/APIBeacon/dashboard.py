@@ -1,7 +1,10 @@
 class Dashboard:
-    def __init__(self,parent: object, **kwargs):
+    __slots__ = ("parent", "original_data", "id", "name", "is_read_only", "embed_url")
+
+    def __init__(self, parent: object, data: dict = None, **kwargs):
         self.parent = parent
-        self.original_data = kwargs
+        kwargs = kwargs if data is None else data  # An API payload given as is isn't copied into keyword arguments
+        self.original_data = kwargs if parent.context.keep_original_data else None
         
         self.id = kwargs.get("id")
         self.name = kwargs.get("displayName")
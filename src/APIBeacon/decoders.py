@@ -0,0 +1,45 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is only required for the fastest decoding: pip install orjson
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec is an alternative to orjson: pip install msgspec
+    msgspec = None
+
+
+def _decoders() -> dict:
+    """Returns the JSON decoders installed, the fastest first. Each one takes the body as bytes or str."""
+    decoders = {}
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+    if msgspec is not None:
+        decoders["msgspec"] = msgspec.json.Decoder().decode
+    decoders["json"] = json.loads
+    return decoders
+
+
+DECODERS = _decoders()
+DECODE_ERRORS = (ValueError,) + ((msgspec.DecodeError,) if msgspec is not None else ())  # orjson and json raise ValueErrors
+
+
+def get_decoder(name: str = None):
+    """Returns a JSON decoder, e.g. to set AbstractPbiAPI.json_decoder.
+
+    Args:
+        name (str, optional): orjson, msgspec or json (the standard library). Defaults to the fastest installed.
+
+    Raises:
+        ValueError: Case the decoder is unknown or its package isn't installed.
+
+    Returns:
+        callable: Function decoding a JSON body, given as bytes or str.
+    """
+    if name is None:
+        return next(iter(DECODERS.values()))
+    if name not in DECODERS:
+        raise ValueError(f"JSON decoder {name} isn't available. Installed decoders: {tuple(DECODERS)}")
+    return DECODERS[name]
@@ -0,0 +1,131 @@
+from operator import itemgetter
+
+from .columnar import TABLES, inventory_columns
+
+
+# Columns identifying a row of every inventory table. Users are only unique within their workspace, and reports are
+# keyed on their id alone so a report bound to another semantic model shows up as a change, not a removal.
+KEYS = {
+    "workspaces": ("id",),
+    "reports": ("id",),
+    "semantic_models": ("id",),
+    "users": ("workspace_id", "email"),
+    "dashboards": ("id",),
+    "apps": ("id",),
+}
+
+
+class TableDiff:
+    """
+    #### Description:
+        Changes of one inventory table between two services.
+
+    #### Attributes:
+        table (str): Name of the table (workspaces, reports, semantic_models, users, dashboards, apps).
+        added (dict): Rows of the new service without a match in the old one, as {key: {column: value}}. Keys are
+            the value of the KEYS column, or a tuple for the tables keyed on several columns.
+        removed (dict): Rows of the old service without a match in the new one, as {key: {column: value}}.
+        changed (dict): Changed columns of the rows found in both, as {key: {column: (old value, new value)}}.
+    """
+
+    def __init__(self, table: str, added: dict, removed: dict, changed: dict) -> None:
+        self.table = table
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def __str__(self) -> str:
+        return f"{self.table}: {len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed"
+
+    def changed_column(self, column: str) -> dict:
+        """Returns the rows where a column changed, as {key: (old value, new value)}."""
+        return {key: columns[column] for key, columns in self.changed.items() if column in columns}
+
+
+class ServiceDiff:
+    """
+    #### Description:
+        Changes between the inventories of two services, e.g. a snapshot of the previous run and the current sync.
+
+    #### Attributes:
+        tables (dict): TableDiff by table name.
+
+    #### Methods:
+        rebound_reports (returns dict): Reports bound to another semantic model, as {report id: (old id, new id)}.
+        access_right_changes (returns dict): Workspace users whose access right changed, as {(workspace id, email): (old, new)}.
+    """
+
+    def __init__(self, tables: dict) -> None:
+        self.tables = tables
+
+    def __getitem__(self, table: str) -> TableDiff:
+        return self.tables[table]
+
+    def __bool__(self) -> bool:
+        return any(self.tables.values())
+
+    def __str__(self) -> str:
+        return "\n".join(str(table_diff) for table_diff in self.tables.values())
+
+    def rebound_reports(self) -> dict:
+        """Returns the reports bound to another semantic model, as {report id: (old dataset id, new dataset id)}."""
+        return self.tables["reports"].changed_column("dataset_id")
+
+    def access_right_changes(self) -> dict:
+        """Returns the workspace users whose access right changed, as {(workspace id, email): (old, new)}."""
+        return self.tables["users"].changed_column("access_right")
+
+
+def _rows_by_key(table: str, columns: dict) -> dict:
+    """Returns the rows of a table as {key: row tuple}, rows being tuples of the values in TABLES order. Keys of a
+    single column are the plain value, keys of several columns a tuple."""
+    names = list(columns)
+    key = itemgetter(*(names.index(column) for column in KEYS[table]))
+    return {key(row): row for row in zip(*columns.values())}
+
+
+def diff_table(table: str, old_columns: dict, new_columns: dict) -> TableDiff:
+    """Compares the columns of one inventory table, as returned by columnar.inventory_columns.
+
+    Keys are compared with set operations, and the rows found on both sides are compared as whole tuples first,
+    so only the rows that actually changed are compared column by column.
+
+    Returns:
+        TableDiff: The added, removed and changed rows.
+    """
+    names = [column for column, _, _, _ in TABLES[table]]
+    old_rows = _rows_by_key(table, old_columns)
+    new_rows = _rows_by_key(table, new_columns)
+    old_keys = old_rows.keys()
+    new_keys = new_rows.keys()
+
+    added = {key: dict(zip(names, new_rows[key])) for key in new_keys - old_keys}
+    removed = {key: dict(zip(names, old_rows[key])) for key in old_keys - new_keys}
+    changed = {}
+    for key in old_keys & new_keys:
+        old_row, new_row = old_rows[key], new_rows[key]
+        if old_row != new_row:
+            changed[key] = {
+                column: (old_value, new_value)
+                for column, old_value, new_value in zip(names, old_row, new_row)
+                if old_value != new_value
+            }
+    return TableDiff(table, added, removed, changed)
+
+
+def diff_services(old, new) -> ServiceDiff:
+    """Compares the loaded inventories of two services. Nothing is requested from the API.
+
+    Args:
+        old (Service): Service before the changes, e.g. restored from a snapshot.
+        new (Service): Service after the changes.
+
+    Returns:
+        ServiceDiff: The changes of every inventory table.
+    """
+    old_tables = inventory_columns(old)
+    new_tables = inventory_columns(new)
+    return ServiceDiff({table: diff_table(table, old_tables[table], new_tables[table]) for table in TABLES})
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class DiskCache:
+    """
+    #### Description:
+        SQLite store of GET responses and their validators (ETag, Last-Modified), kept between runs. Cached
+        responses are revalidated with conditional requests, so an unchanged collection costs a 304 without body.
+        The store is bounded by max_bytes, the least recently used responses being evicted first.
+
+    #### Attributes:
+        directory (str): Directory of the SQLite file.
+        path (str): Path of the SQLite file.
+        max_bytes (int): Maximum size of the stored bodies, in bytes.
+
+    #### Methods:
+        get (returns dict): Returns the stored response of a URL, or None.
+        validators (returns dict): Returns the conditional request headers of a stored response.
+        store (returns None): Stores a response that has validators.
+        touch (returns None): Marks a stored response as used, after a 304.
+        clear (returns None): Drops every stored response.
+        close (returns None): Closes the SQLite connection.
+    """
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024) -> None:
+        """
+        Args:
+            directory (str, optional): Directory of the SQLite file. Defaults to the cache folder next to the log folder.
+            max_bytes (int, optional): Maximum size of the stored bodies, in bytes. Defaults to 256 MB.
+        """
+        self.directory = directory or os.path.join(os.environ['APPDATA'], 'Measure Killer', 'cache')
+        self.path = os.path.join(self.directory, "responses.sqlite")
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA auto_vacuum = FULL")  # Give the space of evicted responses back, only applies to a new file
+        with self._connection:
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    def _key(self, identity: str, url: str) -> str:
+        return hashlib.sha256(f"{identity}\n{url}".encode("utf-8")).hexdigest()
+
+    def get(self, identity: str, url: str) -> dict:
+        """Returns the stored response of url for identity.
+
+        Returns:
+            dict: url, etag, last_modified, headers and body of the response, or None if it isn't stored.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, etag, last_modified, headers, body FROM responses WHERE key = ?", (self._key(identity, url),)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"url": row[0], "etag": row[1], "last_modified": row[2], "headers": json.loads(row[3]), "body": row[4]}
+
+    def validators(self, entry: dict) -> dict:
+        """Returns the If-None-Match/If-Modified-Since headers revalidating a stored response."""
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, identity: str, url: str, response) -> None:
+        """Stores a response, if it has an ETag or a Last-Modified header to revalidate it with.
+
+        Args:
+            identity (str): Identity the response was returned to.
+            url (str): URL of the request.
+            response (requests.models.Response): The response to store.
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+        headers = json.dumps({"Content-Type": response.headers.get("Content-Type", "application/json")})
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, url, etag, last_modified, headers, body, size, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._key(identity, url), url, etag, last_modified, headers, body, len(body), time.time()),
+            )
+            self._evict()
+
+    def touch(self, identity: str, url: str) -> None:
+        """Marks the stored response of url as recently used, after the API confirmed it is unchanged."""
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), self._key(identity, url)))
+
+    def _evict(self) -> None:
+        """Drops the least recently used responses until the stored bodies fit in max_bytes. Called with the lock held."""
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in self._connection.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        """Drops every stored response."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Closes the SQLite connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,109 @@
+from .workspace_index import WorkspaceIndex
+
+
+class LineageIndex(WorkspaceIndex):
+    """
+    #### Description:
+        Bidirectional index between the reports and the semantic models of every workspace of a service. A report's
+        semantic model may live in another workspace, the index answers both directions with dictionary hits instead
+        of scanning every workspace. It is kept up to date as the reports and semantic models of the workspaces load.
+
+    #### Methods:
+        report (returns Report): Returns a loaded report by id.
+        semantic_model (returns SemanticModel): Returns a loaded semantic model by id.
+        dependents (returns set): Returns the reports bound to a semantic model.
+        dependency (returns SemanticModel): Returns the semantic model a report is bound to.
+        impact_of_deleting (returns dict): Returns what deleting some semantic models would break.
+    """
+
+    COLLECTIONS = ("reports", "semantic_models")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._reports = {}  # Report by id
+        self._semantic_models = {}  # SemanticModel by id
+        self._dependents = {}  # Set of reports by semantic model id
+
+    def _add(self, name: str, item) -> None:
+        if name == "reports":
+            self._reports[item.id] = item
+            if item.dataset_id is not None:
+                self._dependents.setdefault(item.dataset_id, set()).add(item)
+        else:
+            self._semantic_models[item.id] = item
+
+    def _remove(self, name: str, item) -> None:
+        if name == "reports":
+            if self._reports.get(item.id) is item:
+                del self._reports[item.id]
+            dependents = self._dependents.get(item.dataset_id)
+            if dependents is not None:
+                dependents.discard(item)
+                if not dependents:
+                    del self._dependents[item.dataset_id]
+        elif self._semantic_models.get(item.id) is item:
+            del self._semantic_models[item.id]
+
+    def report(self, report_id: str):
+        """Returns the loaded report with id report_id, or None."""
+        return self._reports.get(report_id)
+
+    def semantic_model(self, semantic_model_id: str):
+        """Returns the loaded semantic model with id semantic_model_id, or None."""
+        return self._semantic_models.get(semantic_model_id)
+
+    def dependents(self, semantic_model_id: str) -> set:
+        """Returns the loaded reports bound to a semantic model, from every workspace.
+
+        Args:
+            semantic_model_id (str): Id of the semantic model.
+
+        Returns:
+            set: Report objects, empty if no loaded report uses the semantic model.
+        """
+        with self._lock:
+            return set(self._dependents.get(semantic_model_id, ()))
+
+    def dependency(self, report_id: str):
+        """Returns the semantic model a report is bound to.
+
+        Args:
+            report_id (str): Id of the report.
+
+        Returns:
+            SemanticModel: The semantic model, or None if the report or its semantic model isn't loaded.
+        """
+        with self._lock:
+            report = self._reports.get(report_id)
+            return self._semantic_models.get(report.dataset_id) if report is not None else None
+
+    def impact_of_deleting(self, semantic_model_ids) -> dict:
+        """Returns what deleting semantic models would break, for cleanup jobs.
+
+        Args:
+            semantic_model_ids (iterable): Ids of the semantic models to delete.
+
+        Returns:
+            dict: reports (set of the reports bound to them), workspaces (set of the workspaces of those reports),
+                cross_workspace_reports (set of those reports living in another workspace than their semantic model)
+                and unused (set of the ids without any report, safe to delete).
+        """
+        reports = set()
+        cross_workspace_reports = set()
+        unused = set()
+        with self._lock:
+            for semantic_model_id in semantic_model_ids:
+                dependents = self._dependents.get(semantic_model_id)
+                if not dependents:
+                    unused.add(semantic_model_id)
+                    continue
+                reports |= dependents
+                semantic_model = self._semantic_models.get(semantic_model_id)
+                home_id = semantic_model.parent.id if semantic_model is not None else None
+                cross_workspace_reports.update(report for report in dependents if report.parent.id != home_id)
+        return {
+            "reports": reports,
+            "workspaces": {report.parent for report in reports},
+            "cross_workspace_reports": cross_workspace_reports,
+            "unused": unused,
+        }
@@ -0,0 +1,174 @@
+import bisect
+import re
+import threading
+
+
+_ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)$")
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Returns the template of an endpoint, its id segments (GUIDs and numbers) replaced by {id}, so every
+    workspace's groups/<id>/reports is counted as groups/{id}/reports."""
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in endpoint.split("/"))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class _EndpointStats:
+    """Latency histogram and counters of one (method, endpoint template)."""
+
+    __slots__ = ("bucket_counts", "count", "total_seconds", "max_seconds", "bytes_received", "statuses", "retries")
+
+    def __init__(self, buckets: int) -> None:
+        self.bucket_counts = [0] * (buckets + 1)  # The last one counts the requests slower than every bucket
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes_received = 0
+        self.statuses = {}  # Number of responses by status code
+        self.retries = {}  # Number of retries by reason (throttled, timeout)
+
+
+class ApiMetrics:
+    """
+    #### Description:
+        In-process metrics of the API requests, by HTTP method and endpoint template: latency histogram, responses
+        by status code, retries by reason and bytes received, plus the time spent waiting on the rate limiter and on
+        the Retry-After of throttled responses. Readable with summary() or exported in the Prometheus text format.
+
+    #### Attributes:
+        buckets (tuple): Upper bounds of the latency histogram buckets, in seconds.
+        throttle_wait_seconds (dict): Seconds waited before sending requests, by source (rate_limiter, retry_after).
+
+    #### Methods:
+        observe (returns None): Records a response.
+        record_retry (returns None): Records a retry.
+        record_wait (returns None): Records time waited before sending a request.
+        summary (returns list): Returns the stats of every endpoint, the ones taking the most time first.
+        to_prometheus (returns str): Returns the metrics in the Prometheus text exposition format.
+        reset (returns None): Drops every recorded value.
+    """
+
+    DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, buckets=DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drops every recorded value."""
+        with self._lock:
+            self._endpoints = {}  # _EndpointStats by (method, endpoint template)
+            self.throttle_wait_seconds = {"rate_limiter": 0.0, "retry_after": 0.0}
+
+    def _stats(self, method: str, endpoint: str) -> _EndpointStats:
+        """Returns the stats of a method and endpoint template. Called with the lock held."""
+        stats = self._endpoints.get((method, endpoint))
+        if stats is None:
+            stats = self._endpoints[(method, endpoint)] = _EndpointStats(len(self.buckets))
+        return stats
+
+    def observe(self, method: str, endpoint: str, status: int, seconds: float, bytes_received: int) -> None:
+        """Records a response.
+
+        Args:
+            method (str): HTTP verb of the request.
+            endpoint (str): Endpoint template, see endpoint_template.
+            status (int): Status code of the response.
+            seconds (float): Time between sending the request and receiving the whole response.
+            bytes_received (int): Size of the response body.
+        """
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            stats = self._stats(method, endpoint)
+            stats.bucket_counts[bucket] += 1
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.bytes_received += bytes_received
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def record_retry(self, method: str, endpoint: str, reason: str) -> None:
+        """Records a retry of a request, reason being throttled or timeout."""
+        with self._lock:
+            retries = self._stats(method, endpoint).retries
+            retries[reason] = retries.get(reason, 0) + 1
+
+    def record_wait(self, source: str, seconds: float) -> None:
+        """Records seconds waited before sending a request, source being rate_limiter or retry_after."""
+        if seconds:
+            with self._lock:
+                self.throttle_wait_seconds[source] = self.throttle_wait_seconds.get(source, 0.0) + seconds
+
+    def summary(self) -> list:
+        """Returns the stats of every endpoint template, the ones the most time was spent on first.
+
+        Returns:
+            list: dicts with method, endpoint, count, total_seconds, mean_seconds, max_seconds, bytes_received,
+                statuses (count by status code) and retries (count by reason).
+        """
+        with self._lock:
+            summary = [
+                {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": stats.count,
+                    "total_seconds": stats.total_seconds,
+                    "mean_seconds": stats.total_seconds / stats.count if stats.count else 0.0,
+                    "max_seconds": stats.max_seconds,
+                    "bytes_received": stats.bytes_received,
+                    "statuses": dict(stats.statuses),
+                    "retries": dict(stats.retries),
+                }
+                for (method, endpoint), stats in self._endpoints.items()
+            ]
+        return sorted(summary, key=lambda entry: entry["total_seconds"], reverse=True)
+
+    def to_prometheus(self, prefix: str = "pbi_api") -> str:
+        """Returns the metrics in the Prometheus text exposition format, e.g. to serve them on /metrics.
+
+        Args:
+            prefix (str, optional): Prefix of the metric names. Defaults to "pbi_api".
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        duration, responses, retries, received, waited = (
+            f"{prefix}_request_duration_seconds", f"{prefix}_responses_total", f"{prefix}_retries_total",
+            f"{prefix}_response_bytes_total", f"{prefix}_throttle_wait_seconds_total",
+        )
+        lines = [
+            f"# HELP {duration} Latency of the API requests.", f"# TYPE {duration} histogram",
+        ]
+        counters = {responses: [], retries: [], received: []}
+        with self._lock:
+            for (method, endpoint), stats in sorted(self._endpoints.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + ("+Inf",), stats.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f"{duration}_bucket{_labels(method=method, endpoint=endpoint, le=bound)} {cumulative}")
+                lines.append(f"{duration}_sum{_labels(method=method, endpoint=endpoint)} {stats.total_seconds}")
+                lines.append(f"{duration}_count{_labels(method=method, endpoint=endpoint)} {stats.count}")
+                for status, count in sorted(stats.statuses.items()):
+                    counters[responses].append(f"{responses}{_labels(method=method, endpoint=endpoint, status=status)} {count}")
+                for reason, count in sorted(stats.retries.items()):
+                    counters[retries].append(f"{retries}{_labels(method=method, endpoint=endpoint, reason=reason)} {count}")
+                counters[received].append(f"{received}{_labels(method=method, endpoint=endpoint)} {stats.bytes_received}")
+            wait_lines = [f"{waited}{_labels(source=source)} {seconds}" for source, seconds in self.throttle_wait_seconds.items()]
+
+        descriptions = {
+            responses: "Responses of the API by status code.",
+            retries: "Retried requests by reason.",
+            received: "Bytes of the response bodies.",
+        }
+        for name, samples in counters.items():
+            lines += [f"# HELP {name} {descriptions[name]}", f"# TYPE {name} counter", *samples]
+        lines += [f"# HELP {waited} Seconds waited before sending requests.", f"# TYPE {waited} counter", *wait_lines]
+        return "\n".join(lines) + "\n"
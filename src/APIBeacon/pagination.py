@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def iter_pages(fetch_page, page_size: int, prefetch: bool = False):
+    """Yields the items of an OData collection page by page, using $top/$skip, until a page comes back with fewer items than requested.
+
+    Args:
+        fetch_page (callable): Called as fetch_page(top, skip), returns the list of items of that page.
+        page_size (int): Number of items requested per page.
+        prefetch (bool, optional): Fetch the next page in a background thread while the current one is consumed. Defaults to False.
+
+    Yields:
+        dict: Items of the collection, in the order the API returns them.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be a positive integer.")
+
+    skip = 0
+    if not prefetch:
+        while True:
+            page = fetch_page(page_size, skip)
+            yield from page
+            if len(page) != page_size:  # A short page is the last one, a longer one means $top was ignored
+                return
+            skip += page_size
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch_page, page_size, skip)
+        while True:
+            page = future.result()
+            if len(page) != page_size:  # A short page is the last one, a longer one means $top was ignored
+                yield from page
+                return
+            skip += page_size
+            future = executor.submit(fetch_page, page_size, skip)
+            yield from page
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value) -> float:
+    """Parses a Retry-After header, given either in seconds or as an HTTP date.
+
+    Args:
+        value (str): value of the Retry-After header.
+
+    Returns:
+        float: seconds to wait, or None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """
+    #### Description:
+        Token bucket shared by every thread and task sending requests through the API. When Power BI throttles,
+        all the callers are held until Retry-After elapses and the rate is cut down, then the rate grows back
+        while the requests succeed (additive increase, multiplicative decrease). The rate is cut once per throttling
+        episode: the 429s of the requests already sent when the first one came back only extend the hold.
+
+    #### Attributes:
+        max_rate (float): highest rate allowed, in requests per second.
+        min_rate (float): lowest rate the limiter falls back to when throttled, in requests per second.
+        rate (float): current rate, in requests per second.
+        burst (int): number of requests that can be sent at once before the rate applies.
+        backoff_factor (float): factor applied to the rate on each throttled response.
+        recovery_step (float): requests per second regained for each second of successful requests.
+
+    #### Methods:
+        acquire (returns float): Blocks until a request can be sent and returns the seconds waited.
+        acquire_async (returns float): Same as acquire, without blocking the event loop.
+        throttle (returns float): Holds every caller for the given delay and lowers the rate.
+        record_success (returns None): Raises the rate back towards max_rate.
+    """
+
+    def __init__(self, max_rate=50.0, burst=50, min_rate=0.5, backoff_factor=0.5, recovery_step=0.5) -> None:
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.rate = max_rate
+        self.burst = burst
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()  # Theoretical time of the next request, the bucket in its virtual scheduling form
+        self._throttled_at = float("-inf")  # Time of the last rate cut
+        self._held_until = float("-inf")  # End of the hold requested by the last throttle
+
+    def _reserve(self) -> tuple:
+        """Takes a token and returns how long the caller must wait before sending its request, and the part of that
+        wait due to the hold of a throttled response."""
+        with self._lock:
+            now = time.monotonic()
+            interval = 1.0 / self.rate
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + interval
+            delay = max(0.0, slot - now - (self.burst - 1) * interval)
+            return delay, min(delay, max(0.0, self._held_until - now))
+
+    @staticmethod
+    def _report_wait(on_wait, delay: float, held: float) -> None:
+        if on_wait is not None and delay:
+            on_wait("retry_after", held)
+            on_wait("rate_limiter", delay - held)
+
+    def acquire(self, on_wait=None) -> float:
+        """Blocks until a request can be sent.
+
+        Args:
+            on_wait (callable, optional): Called as on_wait(source, seconds) with the seconds waited because of a
+                throttled response (retry_after) and because of the rate (rate_limiter). Defaults to None.
+
+        Returns:
+            float: seconds waited.
+        """
+        delay, held = self._reserve()
+        if delay:
+            time.sleep(delay)
+        self._report_wait(on_wait, delay, held)
+        return delay
+
+    async def acquire_async(self, on_wait=None) -> float:
+        """Waits until a request can be sent, without blocking the event loop.
+
+        Args:
+            on_wait (callable, optional): Same as in acquire. Defaults to None.
+
+        Returns:
+            float: seconds waited.
+        """
+        delay, held = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        self._report_wait(on_wait, delay, held)
+        return delay
+
+    def throttle(self, delay: float, sent_at: float = None) -> float:
+        """Holds every caller for delay seconds and lowers the rate, unless the throttled request was sent before the
+        last rate cut: it then belongs to the same throttling episode and only extends the hold.
+
+        Args:
+            delay (float): seconds to hold, usually the Retry-After of the throttled response.
+            sent_at (float, optional): time.monotonic() when the throttled request was sent. Defaults to None, always
+                lowering the rate.
+
+        Returns:
+            float: the delay applied.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if sent_at is None or sent_at > self._throttled_at:
+                self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+                self._throttled_at = now
+            interval = 1.0 / self.rate
+            # The first request after the pause waits exactly delay, the next ones are spaced by the new rate
+            resume_slot = now + delay + (self.burst - 1) * interval
+            self._held_until = max(self._held_until, now + delay)
+            self._next_slot = max(self._next_slot, resume_slot)
+        return delay
+
+    def record_success(self) -> None:
+        """Raises the rate back towards max_rate after a successful request."""
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.recovery_step / self.rate)
@@ -1,12 +1,14 @@
-from .api import PbiAPI
-
 class Report:
+    __slots__ = (
+        "original_data", "parent", "app_id", "dataset_id", "description", "embed_url", "id", "name",
+        "original_report_id", "type", "web_url", "modified_by", "created_by",
+    )
     
-    def __init__(self,parent: object, **kwargs) -> None:
+    def __init__(self, parent: object, data: dict = None, **kwargs) -> None:
         
-        self.original_data = kwargs
+        kwargs = kwargs if data is None else data  # An API payload given as is isn't copied into keyword arguments
+        self.original_data = kwargs if parent.context.keep_original_data else None
         self.parent = parent  # Workspace object where the report is located
-        self.api = PbiAPI(proxy_url=None).pbi_api
         
         self.app_id = kwargs.get("appId")
         self.dataset_id = kwargs.get("datasetId")
@@ -20,6 +22,11 @@ class Report:
         self.modified_by = kwargs.get("modifiedBy")
         self.created_by = kwargs.get("createdBy")
     
+    @property
+    def api(self):
+        """Returns the API object of the workspace's client context."""
+        return self.parent.api
+
     def __hash__(self) -> int:
         """Returns an integer hash value which is unique for distinct objects, and the same for similar objects"""
         return hash((self.dataset_id, self.id))
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+
+
+class ResponseCache:
+    """
+    #### Description:
+        In-memory cache of GET responses, keyed on the identity of the caller and the URL. Entries expire after a
+        time to live chosen per endpoint, and the least recently used ones are evicted once max_entries is reached.
+
+    #### Attributes:
+        max_entries (int): Maximum number of responses kept.
+        default_ttl (float): Seconds a response is kept when no endpoint pattern matches.
+        endpoint_ttls (dict): Seconds a response is kept by endpoint pattern, relative to BASE_URL and in fnmatch
+            syntax (e.g. "groups/*/users*"). The first matching pattern wins and a TTL of 0 disables caching.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to call the API.
+
+    #### Methods:
+        get (returns requests.models.Response): Returns a cached response that hasn't expired, or None.
+        set (returns None): Caches a response.
+        invalidate (returns int): Drops the responses of an identity under a URL and returns how many were dropped.
+        clear (returns None): Drops every response.
+        stats (returns dict): Returns the hit and miss counters.
+    """
+
+    def __init__(self, max_entries=1024, default_ttl=300, endpoint_ttls=None) -> None:
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = endpoint_ttls or {}
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (identity, url): (expires_at, response), least recently used first
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Returns the time to live of an endpoint, relative to BASE_URL and without query string."""
+        for pattern, ttl in self.endpoint_ttls.items():
+            if fnmatchcase(endpoint, pattern):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key: tuple):
+        """Returns the cached response of key if it hasn't expired.
+
+        Args:
+            key (tuple): (identity, url) of the request.
+
+        Returns:
+            requests.models.Response: The cached response, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: tuple, endpoint: str, response) -> None:
+        """Caches a response for the time to live of its endpoint.
+
+        Args:
+            key (tuple): (identity, url) of the request.
+            endpoint (str): Endpoint of the request, relative to BASE_URL and without query string.
+            response (requests.models.Response): The response to cache.
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, identity: str, url_prefix: str) -> int:
+        """Drops the responses of an identity for url_prefix and every URL under it.
+
+        Args:
+            identity (str): Identity the responses were cached for.
+            url_prefix (str): URL without query string, e.g. the collection a POST or DELETE changed.
+
+        Returns:
+            int: Number of responses dropped.
+        """
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if key[0] == identity and (key[1] == url_prefix or key[1].startswith((url_prefix + "/", url_prefix + "?")))
+            ]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drops every cached response."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Returns the hit and miss counters and the number of cached responses."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
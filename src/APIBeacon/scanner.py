@@ -0,0 +1,195 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from .workspace import Workspace
+from .logger import Logger
+from .api_custom_exceptions import APIError
+from .tracing import tracer
+
+
+class Scanner:
+    """
+    #### Description:
+        Bulk inventory through the admin Scanner API. Workspace ids are sent in batches of up to 100 to
+        admin/workspaces/getInfo, each scan is polled and read on its own thread, and every scan result hydrates
+        the Workspace objects with their reports, semantic models, users and dashboards in one payload.
+        Requires Power BI administrator rights, or a service principal allowed to use the read-only admin APIs.
+
+    #### Attributes:
+        service (Service): Service object owning the API and receiving the workspaces.
+        batch_size (int): Number of workspace ids per scan, at most 100.
+        max_workers (int): Number of scans running at the same time, Power BI allows 16.
+        poll_interval (float): Seconds between two scanStatus requests of a scan.
+        scan_timeout (float): Seconds after which a scan that is not finished is abandoned.
+        scan_options (dict): Query parameters of getInfo (lineage, datasourceDetails, ...).
+
+    #### Methods:
+        get_modified_workspace_ids (returns list): Returns the ids of the workspaces modified since a date.
+        start_scan (returns str): Starts a scan of the given workspace ids and returns its id.
+        wait_for_scan (returns None): Polls scanStatus until the scan succeeds.
+        get_scan_result (returns list): Returns the workspace payloads of a finished scan.
+        scan (returns tuple): Scans the given workspace ids and returns the hydrated workspaces and the errors.
+    """
+
+    MAX_BATCH_SIZE = 100
+
+    def __init__(self, service, batch_size=100, max_workers=16, poll_interval=5, scan_timeout=600, lineage=False, datasource_details=False, dataset_schema=False, dataset_expressions=False, get_artifact_users=True) -> None:
+        """
+        Args:
+            service (Service): Service object owning the API and receiving the workspaces.
+            batch_size (int, optional): Number of workspace ids per scan, at most 100. Defaults to 100.
+            max_workers (int, optional): Number of scans running at the same time. Defaults to 16.
+            poll_interval (float, optional): Seconds between two scanStatus requests of a scan. Defaults to 5.
+            scan_timeout (float, optional): Seconds after which an unfinished scan is abandoned. Defaults to 600.
+            lineage (bool, optional): Return the lineage of the artifacts. Defaults to False.
+            datasource_details (bool, optional): Return the data source details. Defaults to False.
+            dataset_schema (bool, optional): Return the tables and columns of the semantic models. Defaults to False.
+            dataset_expressions (bool, optional): Return the DAX and M expressions of the semantic models. Defaults to False.
+            get_artifact_users (bool, optional): Return the users of the workspaces and artifacts. Defaults to True.
+        """
+        if not 0 < batch_size <= self.MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {self.MAX_BATCH_SIZE}.")
+
+        self.service = service
+        self.api = service.api
+        self.logger = Logger(__name__).get_logger()
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.scan_timeout = scan_timeout
+        self.scan_options = {
+            "lineage": lineage,
+            "datasourceDetails": datasource_details,
+            "datasetSchema": dataset_schema,
+            "datasetExpressions": dataset_expressions,
+            "getArtifactUsers": get_artifact_users,
+        }
+
+    def get_modified_workspace_ids(self, modified_since: datetime = None, exclude_personal_workspaces: bool = True) -> list:
+        """Returns the ids of the workspaces modified since the given date, or of all the workspaces if no date is given.
+
+        Args:
+            modified_since (datetime, optional): Only return the workspaces modified after this date, at most 30 days ago. Defaults to None.
+            exclude_personal_workspaces (bool, optional): Leave out the personal workspaces. Defaults to True.
+
+        Returns:
+            list: Ids of the modified workspaces.
+        """
+        uri_params = [f"excludePersonalWorkspaces={str(exclude_personal_workspaces).lower()}"]
+        if modified_since:
+            if modified_since.tzinfo is None:
+                modified_since = modified_since.replace(tzinfo=timezone.utc)
+            uri_params.append("modifiedSince=" + modified_since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.0000000Z"))
+
+        url = self.api.BASE_URL + "admin/workspaces/modified?" + "&".join(uri_params)
+        response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies, use_cache=False)
+        data = self.api.decode_json(response.content)
+        if not isinstance(data, list):
+            self.logger.error(f"Error getting modified workspaces: {data}")
+            raise TypeError("The response must be a list.")
+        return [workspace["id"] for workspace in data]
+
+    def start_scan(self, workspace_ids: list) -> str:
+        """Starts a scan of the given workspaces.
+
+        Args:
+            workspace_ids (list): Ids of the workspaces to scan, at most 100.
+
+        Returns:
+            str: Id of the scan.
+        """
+        uri_params = "&".join(f"{key}={str(value).lower()}" for key, value in self.scan_options.items())
+        url = self.api.BASE_URL + "admin/workspaces/getInfo?" + uri_params
+        response = self.api.make_api_post_request(url=url, headers=self.api.header, proxies=self.api.proxies, payload={"workspaces": list(workspace_ids)})
+        return self.api.decode_json(response.content)["id"]
+
+    def wait_for_scan(self, scan_id: str) -> None:
+        """Polls scanStatus until the scan succeeds.
+
+        Args:
+            scan_id (str): Id of the scan.
+
+        Raises:
+            APIError: Case the scan fails or doesn't finish within scan_timeout.
+        """
+        url = self.api.BASE_URL + f"admin/workspaces/scanStatus/{scan_id}"
+        deadline = time.monotonic() + self.scan_timeout
+        while True:
+            response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies, use_cache=False)
+            status = self.api.decode_json(response.content).get("status")
+            if status == "Succeeded":
+                return
+            if status == "Failed":
+                raise APIError(f"Scan {scan_id} failed: {response.text}")
+            if time.monotonic() > deadline:
+                raise APIError(f"Scan {scan_id} did not finish within {self.scan_timeout} seconds. Last status: {status}")
+            time.sleep(self.poll_interval)
+
+    def get_scan_result(self, scan_id: str) -> list:
+        """Returns the workspace payloads of a finished scan.
+
+        Args:
+            scan_id (str): Id of the scan.
+
+        Returns:
+            list: One dictionary per scanned workspace.
+        """
+        url = self.api.BASE_URL + f"admin/workspaces/scanResult/{scan_id}"
+        response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies, use_cache=False)
+        data = self.api.decode_json(response.content)
+        if not isinstance(data, dict):
+            self.logger.error(f"Error getting scan result {scan_id}: {data}")
+            raise TypeError("The response must be a dictionary.")
+        return data.get("workspaces", [])
+
+    def _scan_batch(self, workspace_ids: list) -> list:
+        scan_id = self.start_scan(workspace_ids)
+        self.wait_for_scan(scan_id)
+        return self.get_scan_result(scan_id)
+
+    def hydrate(self, data: dict) -> Workspace:
+        """Builds a Workspace, with all its collections, from one workspace of a scan result.
+
+        Args:
+            data (dict): Workspace payload of the scan result.
+
+        Returns:
+            Workspace: The hydrated workspace.
+        """
+        with tracer.span("scanner.hydrate", workspace_id=data.get("id")):
+            workspace = Workspace(self.service, data)
+            workspace.load_scan_result(data)
+        return workspace
+
+    def scan(self, workspace_ids, on_progress=None) -> tuple:
+        """Scans the given workspaces, batch_size ids per scan and max_workers scans at a time.
+
+        A failed batch is logged and collected without stopping the others.
+
+        Args:
+            workspace_ids (iterable): Ids of the workspaces to scan.
+            on_progress (callable, optional): Called as on_progress(completed, total, batch, error) after each batch. Defaults to None.
+
+        Returns:
+            tuple: Set of hydrated Workspace objects, and dictionary of exceptions by batch (tuple of workspace ids).
+        """
+        workspace_ids = list(workspace_ids)
+        batches = [tuple(workspace_ids[i:i + self.batch_size]) for i in range(0, len(workspace_ids), self.batch_size)]
+        workspaces = set()
+        errors = {}
+
+        with tracer.span("scanner.scan", batches=len(batches)), ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(tracer.bind(self._scan_batch), batch): batch for batch in batches}
+            for completed, future in enumerate(as_completed(futures), start=1):
+                batch = futures[future]
+                error = future.exception()
+                if error is not None:
+                    self.logger.error(f"Failed to scan batch of {len(batch)} workspaces starting with {batch[0]}: {error}")
+                    errors[batch] = error
+                else:
+                    workspaces.update(self.hydrate(data) for data in future.result())
+                if on_progress:
+                    on_progress(completed, len(batches), batch, error)
+
+        return workspaces, errors
@@ -1,8 +1,10 @@
 class SemanticModel:
+    __slots__ = ("original_data", "parent", "id", "name", "configured_by", "is_refreshable", "created_date", "storage_mode")
     
-    def __init__(self, parent: object, **kwargs) -> None:
+    def __init__(self, parent: object, data: dict = None, **kwargs) -> None:
 
-        self.original_data = kwargs
+        kwargs = kwargs if data is None else data  # An API payload given as is isn't copied into keyword arguments
+        self.original_data = kwargs if parent.context.keep_original_data else None
         self.parent = parent
         
         self.id = kwargs.get("id")  # semantic_model ID
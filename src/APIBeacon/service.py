@@ -1,56 +1,460 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+
 from .workspace import Workspace
 from .logger import Logger
 from .api import PbiAPI
+from .async_api import AsyncPbiAPI
+from .context import ClientContext
+from .lineage import LineageIndex
+from .access_index import AccessIndex
 from .app import App
+from .pagination import iter_pages
+from .scanner import Scanner
+from .collection_index import IndexedCollection
+from .tracing import tracer
+from . import columnar
+from .snapshot import Snapshot
+from .diff import ServiceDiff, diff_services
 
 class Service:
-    
-    def __init__(self, proxy_url: str = None, saved_token: str = None):
-    
-        self.api = PbiAPI(proxy_url, saved_token).pbi_api  # API object
-        self.logger = Logger(__name__).get_logger()  # Logger object
-        
+
+    workspaces = IndexedCollection("id", "name")
+    apps = IndexedCollection("id")
+
+    HYDRATION_TARGETS = ("reports", "semantic_models", "users", "dashboards")
+    MAX_MODIFIED_SINCE_AGE = timedelta(days=30)  # Oldest modifiedSince accepted by admin/workspaces/modified
+
+    def __init__(self, proxy_url: str = None, saved_token: str = None, credential=None, keep_original_data: bool = True):
+
+        api = PbiAPI(proxy_url, saved_token, credential=credential).pbi_api  # API object
+        self._init_state(ClientContext(api, Logger(__name__).get_logger(), keep_original_data))
+
+    def _init_state(self, context: ClientContext) -> None:
+        self.context = context  # Shared with every entity of the service
         self.workspaces = set()
         self.apps = set()
-        
-    def get_workspaces(self, filter: str = None, top: int = None, skip: int = None):
-        """ Get workspaces that the user has access to."""
-        
+        self.last_sync = None  # Start of the last successful sync, as an aware UTC datetime
+
+    @property
+    def api(self):
+        """Returns the API object of the client context."""
+        return self.context.api
+
+    @property
+    def logger(self):
+        """Returns the logger of the client context."""
+        return self.context.logger
+
+    @property
+    def async_api(self) -> AsyncPbiAPI:
+        """Returns the asyncio API object sharing the authentication of the blocking one, created on first use."""
+        return self.context.async_api
+
+    @async_api.setter
+    def async_api(self, async_api: AsyncPbiAPI) -> None:
+        self.context.async_api = async_api
+
+    async def close_async(self) -> None:
+        """Closes the aiohttp session of async_api and its connections. Await it before the event loop ends, e.g. at the
+        end of the coroutine given to asyncio.run. A session left by an ended event loop is replaced on the next use."""
+        await self.context.close_async()
+
+    @property
+    def lineage(self) -> LineageIndex:
+        """Returns the index between the reports and semantic models of self.workspaces, across workspaces."""
+        return self.context.lineage
+
+    @property
+    def access(self) -> AccessIndex:
+        """Returns the index of the workspaces and access rights of every principal of self.workspaces, by email."""
+        return self.context.access
+
+    def _collection_changed(self, name: str, items: set) -> None:
+        """Called by IndexedCollection after a collection is assigned."""
+        if name == "workspaces":
+            self.context.workspaces_changed(items)
+
+    def find_workspace(self, workspace_id: str) -> Workspace:
+        """ Find a workspace of self.workspaces by its ID, without calling the API. Returns None if it isn't loaded."""
+        return Service.workspaces.lookup(self, "id", workspace_id)
+
+    def find_workspace_by_name(self, name: str) -> Workspace:
+        """ Find a workspace of self.workspaces by its name, without calling the API. Returns None if it isn't loaded."""
+        return Service.workspaces.lookup(self, "name", name)
+
+    def find_app(self, app_id: str) -> App:
+        """ Find an app of self.apps by its ID, without calling the API. Returns None if it isn't loaded."""
+        return Service.apps.lookup(self, "id", app_id)
+
+    def _workspaces_url(self, filter: str = None, top: int = None, skip: int = None) -> str:
         uri_filter = f"$filter={filter}" if filter else ""
         uri_top = f"$top={top}" if top else ""
         uri_skip = f"$skip={skip}" if skip else ""
-        
+
         uri_params = "&".join([param for param in [uri_filter, uri_top, uri_skip] if param])
-        
-        url = self.api.BASE_URL + "groups?" + uri_params
-        response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
-        data = response.json()
+
+        return self.api.BASE_URL + "groups?" + uri_params
+
+    def _load_workspaces(self, data) -> None:
         if isinstance(data, dict):
-            self.workspaces = {Workspace(self,**workspace) for workspace in data.get("value")}
+            with tracer.span("service.load_workspaces"):
+                self.workspaces = {Workspace(self, workspace) for workspace in data.get("value")}
         else:
-            self.logger.error(f"Error getting workspaces: {response}")
+            self.logger.error(f"Error getting workspaces: {data}")
             raise TypeError("The response must be a dictionary.")
-    
+
+    def _load_workspace(self, data) -> Workspace:
+        if isinstance(data, dict):
+            return Workspace(self, data)
+        else:
+            self.logger.error(f"Error getting workspace: {data}")
+            raise TypeError("The response must be a dictionary.")
+
+    def _load_apps(self, data) -> None:
+        if isinstance(data, dict):
+            with tracer.span("service.load_apps"):
+                self.apps = {App(self, app) for app in data.get("value")}
+        else:
+            self.logger.error(f"Error getting apps: {data}")
+            raise TypeError("The response must be a dictionary.")
+
+    def get_workspaces(self, filter: str = None, top: int = None, skip: int = None):
+        """ Get workspaces that the user has access to."""
+
+        url = self._workspaces_url(filter, top, skip)
+        response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
+        self._load_workspaces(self.api.decode_json(response.content))
+
     def get_workspace(self, workspace_id: str):
         """ Get a workspace by its ID."""
-        
+
         url = self.api.BASE_URL + f"groups/{workspace_id}"
         response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
-        data = response.json()
-        if isinstance(data, dict):
-            return Workspace(self,**data)
-        else:
-            self.logger.error(f"Error getting workspace: {response}")
-            raise TypeError("The response must be a dictionary.")
-    
+        return self._load_workspace(self.api.decode_json(response.content))
+
+    def iter_workspaces(self, page_size: int = 5000, filter: str = None, prefetch: bool = False):
+        """ Iterate over the workspaces that the user has access to, fetching them lazily page by page.
+
+        Unlike get_workspaces, nothing is kept in self.workspaces, so the whole tenant doesn't need to fit in memory.
+
+        Args:
+            page_size (int, optional): Number of workspaces requested per page ($top). Defaults to 5000.
+            filter (str, optional): OData $filter applied to the collection. Defaults to None.
+            prefetch (bool, optional): Fetch the next page in the background while the current one is consumed. Defaults to False.
+
+        Raises:
+            TypeError: Case the API response is not a dictionary.
+
+        Yields:
+            Workspace: Workspaces as the pages arrive.
+        """
+
+        def fetch_page(top, skip):
+            url = self._workspaces_url(filter, top, skip)
+            response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
+            data = self.api.decode_json(response.content)
+            if not isinstance(data, dict):
+                self.logger.error(f"Error getting workspaces: {data}")
+                raise TypeError("The response must be a dictionary.")
+            return data.get("value")
+
+        for workspace in iter_pages(fetch_page, page_size, prefetch):
+            yield Workspace(self, workspace)
+
     def get_apps(self):
         """ Get apps in the specified workspace."""
-        
+
         url = self.api.BASE_URL + f"apps"
         response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
-        data = response.json()
-        if isinstance(data, dict):
-            self.apps = {App(self,**app) for app in data.get("value")}
-        else:
-            self.logger.error(f"Error getting apps: {response}")
-            raise TypeError("The response must be a dictionary.")
\ No newline at end of file
+        self._load_apps(self.api.decode_json(response.content))
+
+    async def get_workspaces_async(self, filter: str = None, top: int = None, skip: int = None):
+        """ Get workspaces that the user has access to, without blocking the event loop."""
+
+        data = await self.async_api.make_api_get_request(url=self._workspaces_url(filter, top, skip))
+        self._load_workspaces(data)
+
+    async def get_workspace_async(self, workspace_id: str):
+        """ Get a workspace by its ID, without blocking the event loop."""
+
+        data = await self.async_api.make_api_get_request(url=self.api.BASE_URL + f"groups/{workspace_id}")
+        return self._load_workspace(data)
+
+    async def get_apps_async(self):
+        """ Get apps the user has access to, without blocking the event loop."""
+
+        data = await self.async_api.make_api_get_request(url=self.api.BASE_URL + "apps")
+        self._load_apps(data)
+
+    def _check_hydration_targets(self, include) -> tuple:
+        unknown = [target for target in include if target not in self.HYDRATION_TARGETS]
+        if unknown:
+            raise ValueError(f"Unknown hydration targets {unknown}. Valid targets: {self.HYDRATION_TARGETS}")
+        return tuple(include)
+
+    def _hydrate_workspace(self, workspace: Workspace, include: tuple) -> None:
+        with tracer.span("service.hydrate_workspace", workspace_id=workspace.id):
+            for target in include:
+                getattr(workspace, f"get_{target}")()
+
+    def hydrate_all(self, workers: int = 8, include: tuple = HYDRATION_TARGETS, on_progress=None) -> dict:
+        """Loads the given collections of every workspace in self.workspaces concurrently on a thread pool.
+
+        A failure in one workspace is logged and collected without stopping the others. Keep the API pool_maxsize
+        at least equal to workers, otherwise connections are discarded instead of kept alive.
+
+        Args:
+            workers (int, optional): Number of worker threads. Defaults to 8.
+            include (tuple, optional): Collections to load, among HYDRATION_TARGETS. Defaults to all of them.
+            on_progress (callable, optional): Called as on_progress(completed, total, workspace, error) after each workspace. Defaults to None.
+
+        Raises:
+            ValueError: Case include has an unknown collection.
+
+        Returns:
+            dict: Exceptions by Workspace, for the workspaces that failed.
+        """
+        include = self._check_hydration_targets(include)
+        workspaces = list(self.workspaces)
+        errors = {}
+
+        with tracer.span("service.hydrate_all", workspaces=len(workspaces)), ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(tracer.bind(self._hydrate_workspace), workspace, include): workspace for workspace in workspaces}
+            for completed, future in enumerate(as_completed(futures), start=1):
+                workspace = futures[future]
+                error = future.exception()
+                if error is not None:
+                    self.logger.error(f"Failed to hydrate workspace {workspace}: {error}")
+                    errors[workspace] = error
+                if on_progress:
+                    on_progress(completed, len(workspaces), workspace, error)
+
+        return errors
+
+    async def _hydrate_workspace_async(self, workspace: Workspace, include: tuple) -> None:
+        with tracer.span("service.hydrate_workspace_async", workspace_id=workspace.id):
+            await asyncio.gather(*(getattr(workspace, f"get_{target}_async")() for target in include))
+
+    async def hydrate_all_async(self, include: tuple = HYDRATION_TARGETS, on_progress=None) -> dict:
+        """Loads the given collections of every workspace in self.workspaces concurrently on the event loop.
+
+        The number of requests in flight is bounded by the async_api max_concurrency.
+
+        Args:
+            include (tuple, optional): Collections to load, among HYDRATION_TARGETS. Defaults to all of them.
+            on_progress (callable, optional): Called as on_progress(completed, total, workspace, error) after each workspace. Defaults to None.
+
+        Raises:
+            ValueError: Case include has an unknown collection.
+
+        Returns:
+            dict: Exceptions by Workspace, for the workspaces that failed.
+        """
+        include = self._check_hydration_targets(include)
+        workspaces = list(self.workspaces)
+        errors = {}
+        completed = 0
+
+        async def hydrate(workspace):
+            nonlocal completed
+            error = None
+            try:
+                await self._hydrate_workspace_async(workspace, include)
+            except Exception as e:
+                self.logger.error(f"Failed to hydrate workspace {workspace}: {e}")
+                errors[workspace] = error = e
+            completed += 1
+            if on_progress:
+                on_progress(completed, len(workspaces), workspace, error)
+
+        with tracer.span("service.hydrate_all_async", workspaces=len(workspaces)):
+            await asyncio.gather(*(hydrate(workspace) for workspace in workspaces))
+        return errors
+
+    def scan_workspaces(self, workspace_ids=None, on_progress=None, **scanner_options) -> dict:
+        """Hydrates workspaces through the admin Scanner API instead of four requests per workspace.
+
+        The scanned workspaces, with their reports, semantic models, users and dashboards, replace the ones with the
+        same id in self.workspaces.
+
+        Args:
+            workspace_ids (iterable, optional): Ids of the workspaces to scan. Defaults to the ids in self.workspaces.
+            on_progress (callable, optional): Called as on_progress(completed, total, batch, error) after each batch. Defaults to None.
+            **scanner_options: Keyword arguments of Scanner (batch_size, max_workers, lineage, ...).
+
+        Returns:
+            dict: Exceptions by batch (tuple of workspace ids), for the batches that failed.
+        """
+        if workspace_ids is None:
+            workspace_ids = [workspace.id for workspace in self.workspaces]
+
+        scanned, errors = Scanner(self, **scanner_options).scan(workspace_ids, on_progress)
+        self.workspaces = scanned | {workspace for workspace in self.workspaces if workspace not in scanned}
+        return errors
+
+    def _read_sync_state(self, state_file: str):
+        if not os.path.exists(state_file):
+            return None
+        with open(state_file, "r", encoding="utf-8") as file:
+            last_sync = json.load(file).get("last_sync")
+        return datetime.fromisoformat(last_sync) if last_sync else None
+
+    def _write_sync_state(self, state_file: str) -> None:
+        with open(state_file, "w", encoding="utf-8") as file:
+            json.dump({"last_sync": self.last_sync.isoformat()}, file)
+
+    def sync(self, state_file: str = None, exclude_personal_workspaces: bool = True, on_progress=None, **scanner_options) -> dict:
+        """Incrementally syncs self.workspaces with the tenant through the admin APIs.
+
+        Only the workspaces modified since the last successful sync are scanned and merged into the current
+        workspaces, the deleted ones are removed. Without a previous sync, or if it is older than what
+        admin/workspaces/modified accepts, the whole tenant is scanned. The sync time only moves forward when
+        every batch succeeds, so failed workspaces are picked up again by the next sync.
+
+        Args:
+            state_file (str, optional): JSON file keeping last_sync between runs. Defaults to None, keeping it in memory only.
+            exclude_personal_workspaces (bool, optional): Leave out the personal workspaces. Defaults to True.
+            on_progress (callable, optional): Called as on_progress(completed, total, batch, error) after each batch. Defaults to None.
+            **scanner_options: Keyword arguments of Scanner (batch_size, max_workers, lineage, ...).
+
+        Returns:
+            dict: Exceptions by batch (tuple of workspace ids), for the batches that failed.
+        """
+        sync_started = datetime.now(timezone.utc)
+        if state_file and self.last_sync is None:
+            self.last_sync = self._read_sync_state(state_file)
+
+        modified_since = self.last_sync
+        if modified_since and sync_started - modified_since > self.MAX_MODIFIED_SINCE_AGE:
+            self.logger.warning(f"Last sync {modified_since} is older than {self.MAX_MODIFIED_SINCE_AGE.days} days. Scanning the whole tenant.")
+            modified_since = None
+
+        scanner = Scanner(self, **scanner_options)
+        modified_ids = set(scanner.get_modified_workspace_ids(modified_since, exclude_personal_workspaces))
+        self.logger.info(f"Syncing {len(modified_ids)} workspaces modified since {modified_since}.")
+
+        scanned, errors = scanner.scan(modified_ids, on_progress)
+        scanned_ids = {workspace.id for workspace in scanned}
+        unchanged = {workspace for workspace in self.workspaces if workspace.id not in scanned_ids}
+        self.workspaces = unchanged | {workspace for workspace in scanned if workspace.state != "Deleted"}
+
+        if not errors:
+            self.last_sync = sync_started
+            if state_file:
+                self._write_sync_state(state_file)
+        return errors
+
+    def to_arrow(self) -> dict:
+        """Returns the loaded workspaces, reports, semantic models, users, dashboards and apps as pyarrow tables.
+
+        The tables of the workspace children have a workspace_id column referencing workspaces.id, and reports.dataset_id
+        references semantic_models.id. Nothing is requested from the API, load or sync the service first.
+
+        Raises:
+            ImportError: Case pyarrow isn't installed.
+
+        Returns:
+            dict: pyarrow.Table by table name.
+        """
+        return columnar.to_arrow(self)
+
+    def to_pandas(self) -> dict:
+        """Returns the tables of to_arrow as pandas DataFrames.
+
+        Raises:
+            ImportError: Case pyarrow or pandas isn't installed.
+
+        Returns:
+            dict: pandas.DataFrame by table name.
+        """
+        return columnar.to_pandas(self)
+
+    def save_snapshot(self, path: str) -> None:
+        """Saves the loaded workspaces, with their reports, semantic models, users and dashboards, the apps and
+        last_sync to a SQLite snapshot, replacing its previous content.
+
+        Args:
+            path (str): Path of the snapshot file.
+        """
+        with Snapshot(path) as snapshot:
+            snapshot.save(self)
+
+    def load_snapshot(self, path: str, workspace_ids=None) -> None:
+        """Replaces self.workspaces, self.apps and self.last_sync with the ones of a snapshot, without calling the API.
+
+        Args:
+            path (str): Path of the snapshot file.
+            workspace_ids (iterable, optional): Ids of the workspaces to restore. Defaults to every saved workspace.
+
+        Raises:
+            SnapshotVersionError: Case the snapshot was saved with another schema version.
+        """
+        with Snapshot(path) as snapshot:
+            snapshot.load(self, workspace_ids)
+
+    def iter_snapshot_workspaces(self, path: str, workspace_ids=None):
+        """Restores the workspaces of a snapshot one at a time, without adding them to self.workspaces, so a big
+        tenant can be analysed without holding it all in memory.
+
+        Args:
+            path (str): Path of the snapshot file.
+            workspace_ids (iterable, optional): Ids of the workspaces to restore. Defaults to every saved workspace.
+
+        Raises:
+            SnapshotVersionError: Case the snapshot was saved with another schema version.
+
+        Yields:
+            Workspace: The restored workspaces, with their reports, semantic models, users and dashboards.
+        """
+        with Snapshot(path) as snapshot:
+            yield from snapshot.iter_workspaces(self, workspace_ids)
+
+    @classmethod
+    def offline(cls, keep_original_data: bool = True) -> "Service":
+        """Returns a Service that never authenticates, to restore, iterate and diff snapshots without any API call
+        nor login. Its api is None, so the methods requesting the API can't be used.
+
+        Args:
+            keep_original_data (bool, optional): Keep the restored fields of each entity in its original_data. Defaults to True.
+
+        Returns:
+            Service: Service with no workspace and no app.
+        """
+        service = cls.__new__(cls)
+        service._init_state(ClientContext(None, Logger(__name__).get_logger(), keep_original_data))
+        return service
+
+    @classmethod
+    def from_snapshot(cls, path: str, workspace_ids=None, keep_original_data: bool = True) -> "Service":
+        """Returns an offline Service restored from a snapshot, e.g. to diff two saved runs without authenticating.
+
+        Args:
+            path (str): Path of the snapshot file.
+            workspace_ids (iterable, optional): Ids of the workspaces to restore. Defaults to every saved workspace.
+            keep_original_data (bool, optional): Keep the restored fields of each entity in its original_data. Defaults to True.
+
+        Raises:
+            SnapshotVersionError: Case the snapshot was saved with another schema version.
+
+        Returns:
+            Service: The offline service holding the inventory of the snapshot.
+        """
+        service = cls.offline(keep_original_data)
+        service.load_snapshot(path, workspace_ids)
+        return service
+
+    def diff(self, previous: "Service") -> ServiceDiff:
+        """Returns what changed from the inventory of previous to the one of self, e.g. against a snapshot of the
+        previous run restored with Service.from_snapshot. Nothing is requested from the API.
+
+        Args:
+            previous (Service): Service holding the older inventory.
+
+        Returns:
+            ServiceDiff: Added, removed and changed rows by table, with rebound_reports and access_right_changes shortcuts.
+        """
+        return diff_services(previous, self)
@@ -1,6 +1,19 @@
+import threading
+
+
 class SingletonMeta(type):
+    """Keeps one instance per class, or one per key when the class defines a _singleton_key classmethod taking the
+    constructor arguments. Instances are created under a lock with double-checked locking, so concurrent first uses
+    from several threads still share one instance."""
     _instances = {}
+    _lock = threading.RLock()  # Reentrant, as the __init__ of a singleton may create other singletons
+
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super().__call__(*args, **kwargs)
-        return cls._instances[cls]
+        key = (cls, cls._singleton_key(*args, **kwargs)) if hasattr(cls, "_singleton_key") else cls
+        instance = cls._instances.get(key)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(key)
+                if instance is None:
+                    instance = cls._instances[key] = super().__call__(*args, **kwargs)
+        return instance
@@ -0,0 +1,203 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from .api_custom_exceptions import SnapshotVersionError
+from .app import App
+from .columnar import TABLES, WORKSPACE_CHILDREN, inventory_columns
+from .dashboard import Dashboard
+from .report import Report
+from .semantic_model import SemanticModel
+from .user import User
+from .workspace import Workspace
+
+
+class Snapshot:
+    """
+    #### Description:
+        SQLite file holding the whole inventory of a Service: workspaces with their reports, semantic models, users
+        and dashboards, the apps and the last sync time. One table per entity type, with the columns of the columnar
+        export, so a snapshot can also be queried with plain SQL. Restoring needs no API call, and the workspaces can
+        be restored one at a time to keep the memory flat on big tenants.
+        Restored entities get the saved fields as original_data, fields the package doesn't map aren't saved.
+
+    #### Attributes:
+        path (str): Path of the SQLite file.
+        SCHEMA_VERSION (int): Version of the tables, saved in the meta table and checked when restoring.
+
+    #### Methods:
+        save (returns None): Replaces the content of the snapshot with the inventory of a service.
+        metadata (returns dict): Returns the schema version, the save time and the last sync of the snapshot.
+        workspace_ids (returns list): Returns the ids of the saved workspaces.
+        load_workspace (returns Workspace): Restores one workspace with its reports, semantic models, users and dashboards.
+        iter_workspaces (returns generator): Restores the workspaces one at a time.
+        load (returns None): Restores the workspaces, the apps and the last sync of a service.
+        close (returns None): Closes the SQLite connection.
+    """
+
+    SCHEMA_VERSION = 1
+    CLASSES = {"workspaces": Workspace, "reports": Report, "semantic_models": SemanticModel, "users": User, "dashboards": Dashboard, "apps": App}
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): Path of the SQLite file, created on the first save.
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _create_tables(self) -> None:
+        """Drops and creates the tables of SCHEMA_VERSION. Called inside a transaction."""
+        self._connection.execute("DROP TABLE IF EXISTS meta")
+        self._connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        for table, spec in TABLES.items():
+            columns = ", ".join(f"{column} {'INTEGER' if type_name == 'bool_' else 'TEXT'}" for column, _, _, type_name in spec)
+            self._connection.execute(f"DROP TABLE IF EXISTS {table}")
+            self._connection.execute(f"CREATE TABLE {table} ({columns})")
+            if table in WORKSPACE_CHILDREN:
+                self._connection.execute(f"CREATE INDEX {table}_workspace_id ON {table} (workspace_id)")
+        self._connection.execute("CREATE UNIQUE INDEX workspaces_id ON workspaces (id)")
+
+    def save(self, service) -> None:
+        """Replaces the content of the snapshot with the loaded inventory of a service, in a single transaction.
+
+        Args:
+            service (Service): Service to save. Nothing is requested from the API, load or sync it first.
+        """
+        tables = inventory_columns(service)
+        meta = {
+            "schema_version": str(self.SCHEMA_VERSION),
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "last_sync": service.last_sync.isoformat() if service.last_sync else None,
+        }
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")  # sqlite3 doesn't open one for DROP/CREATE, the old tables would be committed away
+            self._create_tables()
+            self._connection.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", meta.items())
+            for table, columns in tables.items():
+                names = list(columns)
+                placeholders = ", ".join("?" for _ in names)
+                self._connection.executemany(
+                    f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})", zip(*columns.values())
+                )
+
+    def metadata(self) -> dict:
+        """Returns the meta table of the snapshot.
+
+        Raises:
+            SnapshotVersionError: Case the snapshot is empty or has another schema version than SCHEMA_VERSION.
+
+        Returns:
+            dict: schema_version (int), saved_at and last_sync (aware datetimes, last_sync can be None).
+        """
+        with self._lock:
+            try:
+                meta = dict(self._connection.execute("SELECT key, value FROM meta"))
+            except sqlite3.OperationalError:  # No meta table, nothing was ever saved to this file
+                raise SnapshotVersionError(message=f"{self.path} is not a snapshot.") from None
+
+        version = int(meta.get("schema_version") or 0)
+        if version != self.SCHEMA_VERSION:
+            raise SnapshotVersionError(version)
+        return {
+            "schema_version": version,
+            "saved_at": datetime.fromisoformat(meta["saved_at"]),
+            "last_sync": datetime.fromisoformat(meta["last_sync"]) if meta.get("last_sync") else None,
+        }
+
+    def _rows(self, table: str, where: str = "", parameters: tuple = ()) -> list:
+        """Returns the rows of a table as API payloads, the kwargs the entity classes are built from."""
+        spec = [entry for entry in TABLES[table] if entry[1] is not None]
+        columns = ", ".join(column for column, _, _, _ in spec)
+        with self._lock:
+            rows = self._connection.execute(f"SELECT {columns} FROM {table} {where}", parameters).fetchall()
+
+        payloads = []
+        for row in rows:
+            payload = {}
+            for (_, _, key, type_name), value in zip(spec, row):
+                payload[key] = bool(value) if type_name == "bool_" and value is not None else value
+            payloads.append(payload)
+        return payloads
+
+    def workspace_ids(self) -> list:
+        """Returns the ids of the saved workspaces."""
+        self.metadata()
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT id FROM workspaces")]
+
+    def _build_workspace(self, service, payload: dict) -> Workspace:
+        workspace = Workspace(service, payload)
+        for table in WORKSPACE_CHILDREN:
+            entity_class = self.CLASSES[table]
+            setattr(workspace, table, {
+                entity_class(workspace, row) for row in self._rows(table, "WHERE workspace_id = ?", (workspace.id,))
+            })
+        return workspace
+
+    def load_workspace(self, service, workspace_id: str) -> Workspace:
+        """Restores one workspace with its reports, semantic models, users and dashboards. It isn't added to service.workspaces.
+
+        Args:
+            service (Service): Service the workspace belongs to, for its client context.
+            workspace_id (str): Id of the workspace.
+
+        Raises:
+            SnapshotVersionError: Case the snapshot has another schema version than SCHEMA_VERSION.
+
+        Returns:
+            Workspace: The workspace, or None if it isn't in the snapshot.
+        """
+        self.metadata()
+        rows = self._rows("workspaces", "WHERE id = ?", (workspace_id,))
+        return self._build_workspace(service, rows[0]) if rows else None
+
+    def iter_workspaces(self, service, workspace_ids=None):
+        """Restores the workspaces one at a time, each with its reports, semantic models, users and dashboards.
+
+        Args:
+            service (Service): Service the workspaces belong to, for its client context.
+            workspace_ids (iterable, optional): Ids of the workspaces to restore. Defaults to every saved workspace.
+
+        Raises:
+            SnapshotVersionError: Case the snapshot has another schema version than SCHEMA_VERSION.
+
+        Yields:
+            Workspace: The restored workspaces. They aren't added to service.workspaces.
+        """
+        if workspace_ids is None:
+            workspace_ids = self.workspace_ids()
+        else:
+            self.metadata()
+        for workspace_id in workspace_ids:
+            for row in self._rows("workspaces", "WHERE id = ?", (workspace_id,)):
+                yield self._build_workspace(service, row)
+
+    def load(self, service, workspace_ids=None) -> None:
+        """Replaces the workspaces, apps and last_sync of a service with the ones of the snapshot.
+
+        Args:
+            service (Service): Service to restore.
+            workspace_ids (iterable, optional): Ids of the workspaces to restore. Defaults to every saved workspace.
+
+        Raises:
+            SnapshotVersionError: Case the snapshot has another schema version than SCHEMA_VERSION.
+        """
+        service.last_sync = self.metadata()["last_sync"]
+        service.workspaces = set(self.iter_workspaces(service, workspace_ids))
+        service.apps = {App(service, row) for row in self._rows("apps")}
+
+    def close(self) -> None:
+        """Closes the SQLite connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,112 @@
+import json
+import os
+import time
+
+import jwt
+from msal_extensions import CrossPlatLock, FilePersistence, build_encrypted_persistence
+from msal_extensions.persistence import PersistenceNotFound
+
+from .logger import Logger
+
+
+class TokenCache:
+    """
+    #### Description:
+        Encrypted-at-rest cache of access tokens shared by all the processes of the host, so a new worker reuses the
+        token of the previous one instead of authenticating again. Tokens are kept with the expiry of their JWT and
+        reused until refresh_margin seconds before it. Every read and write holds a file lock, so concurrent processes
+        never see a half written cache. Encryption comes from msal-extensions: DPAPI on Windows, Keychain on macOS
+        and libsecret on Linux.
+
+    #### Attributes:
+        path (str): Path of the encrypted cache file.
+        refresh_margin (float): Seconds before expiry after which a cached token is no longer reused.
+        encrypted (bool): False when the cache fell back to a plain file because allow_unencrypted was set.
+
+    #### Methods:
+        load (returns str): Returns the cached token of a key if it isn't close to expiry, or None.
+        save (returns None): Caches a token with the expiry read from its JWT.
+        remove (returns None): Drops the cached token of a key.
+    """
+
+    def __init__(self, path=None, refresh_margin=300, allow_unencrypted=False) -> None:
+        """
+        Args:
+            path (str, optional): Path of the cache file. Defaults to the cache folder next to the log folder.
+            refresh_margin (float, optional): Seconds before expiry after which a cached token is no longer reused. Defaults to 300.
+            allow_unencrypted (bool, optional): Fall back to a plain file when the platform encryption isn't available. Defaults to False.
+
+        Raises:
+            Exception: Case the platform encryption isn't available and allow_unencrypted is False.
+        """
+        self.logger = Logger(__name__).get_logger()
+        self.path = path or os.path.join(os.environ['APPDATA'], 'Measure Killer', 'cache', 'token_cache.bin')
+        self.refresh_margin = refresh_margin
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock_path = self.path + ".lockfile"
+        self.encrypted = True
+        try:
+            self._persistence = build_encrypted_persistence(self.path)
+        except Exception:  # msal-extensions raises a different error per platform when the encryption is missing
+            if not allow_unencrypted:
+                raise
+            self.logger.warning(f"Encryption is not available on this host, the token cache {self.path} is stored in plain text.")
+            # Private to the current user before the first token is written, whatever the umask
+            os.close(os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o600))
+            os.chmod(self.path, 0o600)  # A file left by an earlier run may be wider
+            self._persistence = FilePersistence(self.path)
+            self.encrypted = False
+
+    @staticmethod
+    def token_expiry(access_token: str) -> float:
+        """Returns the expiry of an access token, from the exp claim of its JWT, as a UNIX timestamp."""
+        return jwt.decode(access_token, options={"verify_signature": False})["exp"]
+
+    def _read(self) -> dict:
+        """Returns the cached tokens by key. Called with the file lock held."""
+        try:
+            content = self._persistence.load()
+        except PersistenceNotFound:
+            return {}
+        try:
+            return json.loads(content) if content else {}
+        except ValueError:
+            self.logger.warning(f"Token cache {self.path} is corrupted and will be overwritten.")
+            return {}
+
+    def load(self, key: str) -> str:
+        """Returns the cached access token of key, unless it expires within refresh_margin.
+
+        Args:
+            key (str): Key the token was cached under (authority, tenant, client...).
+
+        Returns:
+            str: The access token, or None.
+        """
+        with CrossPlatLock(self._lock_path):
+            entry = self._read().get(key)
+        if entry and entry["expires_on"] - self.refresh_margin > time.time():
+            return entry["access_token"]
+        return None
+
+    def save(self, key: str, access_token: str) -> None:
+        """Caches an access token under key with the expiry of its JWT, and drops the expired ones.
+
+        Args:
+            key (str): Key to cache the token under.
+            access_token (str): The access token.
+        """
+        expires_on = self.token_expiry(access_token)
+        with CrossPlatLock(self._lock_path):
+            now = time.time()
+            tokens = {cached_key: entry for cached_key, entry in self._read().items() if entry["expires_on"] > now}
+            tokens[key] = {"access_token": access_token, "expires_on": expires_on}
+            self._persistence.save(json.dumps(tokens))  # Rewrites the file in place, keeping its permissions
+
+    def remove(self, key: str) -> None:
+        """Drops the cached access token of key, e.g. when the API rejected it."""
+        with CrossPlatLock(self._lock_path):
+            tokens = self._read()
+            if tokens.pop(key, None) is not None:
+                self._persistence.save(json.dumps(tokens))
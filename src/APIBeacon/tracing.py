@@ -0,0 +1,205 @@
+import contextvars
+import functools
+import threading
+import time
+from collections import deque
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # OpenTelemetry is only required to export the spans to an OpenTelemetry backend
+    otel_trace = None
+
+from .singleton import SingletonMeta
+
+
+class _NoopSpan:
+    """Span returned while tracing is disabled, entering and leaving it does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+    def set_attribute(self, key: str, value) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span = contextvars.ContextVar("APIBeacon_current_span", default=None)
+
+
+class Span:
+    """
+    #### Description:
+        Timed operation recorded by the built-in tracer. The span entered last in the same thread or asyncio task is
+        its parent, so nested spans form a tree.
+
+    #### Attributes:
+        name (str): Name of the operation, e.g. http.request.
+        attributes (dict): Details of the operation (endpoint, status, count...).
+        parent (Span): Enclosing span, None for a root span.
+        start (float): perf_counter when the span was entered.
+        duration (float): Seconds between entering and leaving the span, None while it runs.
+        children_duration (float): Seconds spent in its direct children, to tell its own time apart.
+        error (str): Name of the exception that left the span, None if it succeeded.
+    """
+
+    __slots__ = ("tracer", "name", "attributes", "parent", "start", "duration", "children_duration", "error", "_token")
+
+    def __init__(self, tracer, name: str, attributes: dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.parent = None
+        self.start = None
+        self.duration = None
+        self.children_duration = 0.0
+        self.error = None
+        self._token = None
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.duration = time.perf_counter() - self.start
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        if self.parent is not None:
+            self.parent.children_duration += self.duration
+        self.tracer._finish(self)
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    @property
+    def self_duration(self) -> float:
+        """Seconds spent in the span itself, outside of its children. Children running in parallel may add up to more
+        than the span, which then has no own time."""
+        return max(0.0, self.duration - self.children_duration)
+
+
+class Tracer(metaclass=SingletonMeta):
+    """
+    #### Description:
+        Optional tracing of the package: spans around authentication, HTTP requests, JSON decoding and entity
+        hydration. Disabled by default, span() then returns a shared no-op span, so the instrumented code costs an
+        attribute check. Once enabled, spans are exported to OpenTelemetry when requested and installed, or recorded
+        in memory and summarised by name.
+
+    #### Attributes:
+        enabled (bool): Spans are recorded.
+        max_spans (int): Number of finished spans kept in memory by the built-in tracer.
+        on_end (callable): Called with each finished Span of the built-in tracer, e.g. to log or export it.
+
+    #### Methods:
+        enable (returns None): Starts recording spans.
+        disable (returns None): Stops recording spans.
+        span (returns context manager): Returns a span to use in a with statement.
+        bind (returns callable): Binds a function to the current span, before running it on another thread.
+        finished_spans (returns list): Returns the finished spans kept in memory.
+        summary (returns list): Returns the count, total and own time of the finished spans by name.
+        clear (returns None): Drops the finished spans kept in memory.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.max_spans = 10000
+        self.on_end = None
+        self._otel_tracer = None
+        self._lock = threading.Lock()
+        self._spans = deque(maxlen=self.max_spans)
+
+    def enable(self, opentelemetry: bool = False, max_spans: int = 10000, on_end=None) -> None:
+        """Starts recording spans.
+
+        Args:
+            opentelemetry (bool, optional): Export the spans through the OpenTelemetry tracer provider set up by the
+                application instead of keeping them in memory. Defaults to False.
+            max_spans (int, optional): Number of finished spans kept in memory by the built-in tracer. Defaults to 10000.
+            on_end (callable, optional): Called with each finished Span of the built-in tracer. Defaults to None.
+
+        Raises:
+            ImportError: Case opentelemetry is True and opentelemetry-api isn't installed.
+        """
+        if opentelemetry and otel_trace is None:
+            raise ImportError("Tracing to OpenTelemetry requires opentelemetry-api: pip install opentelemetry-api")
+        self._otel_tracer = otel_trace.get_tracer("APIBeacon") if opentelemetry else None
+        self.on_end = on_end
+        with self._lock:
+            self.max_spans = max_spans
+            self._spans = deque(self._spans, maxlen=max_spans)
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stops recording spans. The finished spans kept in memory stay available."""
+        self.enabled = False
+
+    def span(self, name: str, **attributes):
+        """Returns a span timing the body of a with statement, a child of the span entered before it.
+
+        Args:
+            name (str): Name of the operation.
+            **attributes: Details of the operation.
+
+        Returns:
+            context manager: The span, with a set_attribute(key, value) method.
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        if self._otel_tracer is not None:
+            return self._otel_tracer.start_as_current_span(name, attributes=attributes)
+        return Span(self, name, attributes)
+
+    def bind(self, function):
+        """Returns function bound to the current span, so the spans it enters on a worker thread are its children.
+
+        Args:
+            function (callable): Function to submit to a thread pool.
+
+        Returns:
+            callable: function itself while tracing is disabled.
+        """
+        if not self.enabled:
+            return function
+        return functools.partial(contextvars.copy_context().run, function)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+        if self.on_end is not None:
+            self.on_end(span)
+
+    def finished_spans(self) -> list:
+        """Returns the finished spans kept in memory, oldest first."""
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self) -> list:
+        """Returns the finished spans kept in memory aggregated by name, the ones the most own time was spent in first.
+
+        Returns:
+            list: dicts with name, count, total_seconds, self_seconds (outside of child spans) and errors.
+        """
+        totals = {}
+        for span in self.finished_spans():
+            entry = totals.setdefault(span.name, {"name": span.name, "count": 0, "total_seconds": 0.0, "self_seconds": 0.0, "errors": 0})
+            entry["count"] += 1
+            entry["total_seconds"] += span.duration
+            entry["self_seconds"] += span.self_duration
+            entry["errors"] += span.error is not None
+        return sorted(totals.values(), key=lambda entry: entry["self_seconds"], reverse=True)
+
+    def clear(self) -> None:
+        """Drops the finished spans kept in memory."""
+        with self._lock:
+            self._spans.clear()
+
+
+tracer = Tracer()
@@ -2,23 +2,36 @@ from .report import Report
 from .user import User
 from .semantic_model import SemanticModel
 from .dashboard import Dashboard
-from .api import PbiAPI
-from .logger import Logger
+from .pagination import iter_pages
+from .collection_index import IndexedCollection
+from .tracing import tracer
 
 class Workspace:
+
+    reports = IndexedCollection("id")
+    semantic_models = IndexedCollection("id")
+    dashboards = IndexedCollection("id")
+    users = IndexedCollection("email")
+
+    __slots__ = (
+        "original_data", "parent", "context", "id", "name", "is_read_only", "is_on_dedicated_capacity", "capacity_id", "state",
+        "dataflows", "data_sources", "_reports", "_reports_index", "_semantic_models", "_semantic_models_index",
+        "_dashboards", "_dashboards_index", "_users", "_users_index",
+    )
     
-    def __init__(self, parent: object, **kwargs) -> None:
+    def __init__(self, parent: object, data: dict = None, **kwargs) -> None:
        
-        self.original_data = kwargs
+        kwargs = kwargs if data is None else data  # An API payload given as is isn't copied into keyword arguments
+        self.original_data = kwargs if parent.context.keep_original_data else None
         self.parent = parent
-        self.api = PbiAPI(proxy_url=None).pbi_api
-        self.logger = Logger(__name__).get_logger()  # Logger object
+        self.context = parent.context  # API and logger shared with the service
         
         self.id = kwargs.get("id")  # Workspace ID
         self.name = kwargs.get("name")  # Workspace name
         self.is_read_only = kwargs.get("isReadOnly")  # Workspace is read only
         self.is_on_dedicated_capacity = kwargs.get("isOnDedicatedCapacity")  # Workspace is on a premium workspace? if yes this value will not be None
         self.capacity_id = kwargs.get("capacityId")  # Capacity ID
+        self.state = kwargs.get("state")  # Workspace state, only returned by the admin APIs (Active, Deleted, ...)
         
         #object sets
         self.reports = set()
@@ -42,21 +55,102 @@ class Workspace:
         """Returns a string representation of the object"""
         return f"{self.name} ({self.id})"
     
+    def _collection_changed(self, name: str, items: set) -> None:
+        """Called by IndexedCollection after a collection is assigned."""
+        self.context.collection_changed(self, name, items)
+
+    def find_report(self, report_id: str) -> Report:
+        """Find a report of self.reports by its ID, without calling the API. Returns None if it isn't loaded."""
+        return Workspace.reports.lookup(self, "id", report_id)
+
+    def find_semantic_model(self, semantic_model_id: str) -> SemanticModel:
+        """Find a semantic model of self.semantic_models by its ID, without calling the API. Returns None if it isn't loaded."""
+        return Workspace.semantic_models.lookup(self, "id", semantic_model_id)
+
+    def find_dashboard(self, dashboard_id: str) -> Dashboard:
+        """Find a dashboard of self.dashboards by its ID, without calling the API. Returns None if it isn't loaded."""
+        return Workspace.dashboards.lookup(self, "id", dashboard_id)
+
+    def find_user(self, email: str) -> User:
+        """Find a user of self.users by its email, without calling the API. Returns None if it isn't loaded."""
+        return Workspace.users.lookup(self, "email", email)
+
+    @property
+    def api(self):
+        """Returns the API object of the client context."""
+        return self.context.api
+
+    @property
+    def logger(self):
+        """Returns the logger of the client context."""
+        return self.context.logger
+
+    @property
+    def async_api(self):
+        """Returns the asyncio API object of the client context."""
+        return self.context.async_api
+
+    def _users_url(self, top: int = None, skip: int = None) -> str:
+        uri_top = f"$top={top}" if top else ""
+        uri_skip = f"$skip={skip}" if skip else ""
+        
+        uri_params = "&".join([param for param in [uri_top, uri_skip] if param])
+        
+        return self.api.BASE_URL + f"groups/{self.id}/users?" + uri_params
+
+    def _load_reports(self, data) -> None:
+        if isinstance(data, dict):
+            with tracer.span("workspace.load_reports", workspace_id=self.id):
+                self.reports = {Report(self, report) for report in data.get("value")}
+        else:
+            self.logger.error(f"Failed to get reports from workspace {self.name}.")
+            raise TypeError(f"Failed to get reports from workspace {self.name}.")
+
+    def _load_semantic_models(self, data) -> None:
+        if isinstance(data, dict):
+            with tracer.span("workspace.load_semantic_models", workspace_id=self.id):
+                self.semantic_models = {SemanticModel(self, model) for model in data.get("value")}
+        else:
+            self.logger.error(f"Failed to get semantic models from workspace {self.name}.")
+            raise TypeError("The response must be a dictionary.")
+
+    def _load_users(self, data) -> None:
+        if isinstance(data, dict):
+            with tracer.span("workspace.load_users", workspace_id=self.id):
+                self.users = {User(self, user) for user in data.get("value")}
+        else:
+            self.logger.error(f"Error getting users: {data}")
+            raise TypeError("The response must be a dictionary.")
+
+    def _load_dashboards(self, data) -> None:
+        if isinstance(data, dict):
+            with tracer.span("workspace.load_dashboards", workspace_id=self.id):
+                self.dashboards = {Dashboard(self, dashboard) for dashboard in data.get("value")}
+        else:
+            self.logger.error(f"Error getting dashboards: {data}")
+            raise TypeError("The response must be a dictionary.")
+
+    def load_scan_result(self, data: dict) -> None:
+        """Loads the reports, semantic models, users and dashboards from the workspace payload of an admin scan result
+
+        Args:
+            data (dict): Workspace payload of admin/workspaces/scanResult.
+        """
+        self._load_reports({"value": data.get("reports", [])})
+        self._load_semantic_models({"value": data.get("datasets", [])})
+        self._load_users({"value": data.get("users", [])})
+        self._load_dashboards({"value": data.get("dashboards", [])})
+
     def get_reports(self) -> None:
         """Get all the reports and paginated reports from the workspace
 
         Raises:
             TypeError: Case the API response is not a dictionary.
         """
-        url = self.api.BASE_URL + f"groups/{self.id}/reports"
-        response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
-        data = response.json()
-        if isinstance(data, dict):
-            self.reports = {Report(self,**report) for report in data.get("value")}
-               
-        else:
-            self.logger = Logger(__name__).get_logger()  # Logger object
-            raise TypeError(f"Failed to get reports from workspace {self.name}.")
+        with tracer.span("workspace.get_reports", workspace_id=self.id):
+            url = self.api.BASE_URL + f"groups/{self.id}/reports"
+            response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
+            self._load_reports(self.api.decode_json(response.content))
         
     def get_semantic_models(self) -> None:
         """Get all the semantic models from the workspace
@@ -64,14 +158,10 @@ class Workspace:
         Raises:
             TypeError: Case the API response is not a dictionary.
         """
-        url = self.api.BASE_URL + f"groups/{self.id}/datasets"
-        response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
-        data = response.json()
-        if isinstance(data, dict):
-            self.semantic_models = {SemanticModel(self,**model) for model in data.get("value")}
-        else:
-            self.logger.error(f"Failed to get semantic models from workspace {self.name}.")
-            raise TypeError("The response must be a dictionary.")
+        with tracer.span("workspace.get_semantic_models", workspace_id=self.id):
+            url = self.api.BASE_URL + f"groups/{self.id}/datasets"
+            response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
+            self._load_semantic_models(self.api.decode_json(response.content))
     
     def get_users(self, top: int = None, skip: int = None):
         """Get users in the workspace
@@ -83,26 +173,77 @@ class Workspace:
         Raises:
             TypeError: Case the API response is not a dictionary.
         """
-        uri_top = f"$top={top}" if top else ""
-        uri_skip = f"$skip={skip}" if skip else ""
-        
-        uri_params = "&".join([param for param in [uri_top, uri_skip] if param])
-        
-        url = self.api.BASE_URL + f"groups/{self.id}/users?" + uri_params
-        response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
-        data = response.json()
-        if isinstance(data, dict):
-            self.users = {User(self,**user) for user in data.get("value")}
-        else:
-            self.logger.error(f"Error getting users: {response}")
-            raise TypeError("The response must be a dictionary.")
+        with tracer.span("workspace.get_users", workspace_id=self.id):
+            url = self._users_url(top, skip)
+            response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
+            self._load_users(self.api.decode_json(response.content))
         
+    def iter_users(self, page_size: int = 1000, prefetch: bool = False):
+        """Iterate over the users of the workspace, fetching them lazily page by page
+
+        Args:
+            page_size (int, optional): Number of users requested per page ($top). Defaults to 1000.
+            prefetch (bool, optional): Fetch the next page in the background while the current one is consumed. Defaults to False.
+
+        Raises:
+            TypeError: Case the API response is not a dictionary.
+
+        Yields:
+            User: Users as the pages arrive.
+        """
+
+        def fetch_page(top, skip):
+            response = self.api.make_api_get_request(url=self._users_url(top, skip), headers=self.api.header, proxies=self.api.proxies)
+            data = self.api.decode_json(response.content)
+            if not isinstance(data, dict):
+                self.logger.error(f"Error getting users: {data}")
+                raise TypeError("The response must be a dictionary.")
+            return data.get("value")
+
+        for user in iter_pages(fetch_page, page_size, prefetch):
+            yield User(self, user)
+
     def get_dashboards(self):
-        url = self.api.BASE_URL + f"groups/{self.id}/dashboards"
-        response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
-        data = response.json()
-        if isinstance(data, dict):
-            self.dashboards = {Dashboard(self,**dashboard) for dashboard in data.get("value")}
-        else:
-            self.logger.error(f"Error getting dashboards: {response}")
-            raise TypeError("The response must be a dictionary.")
\ No newline at end of file
+        with tracer.span("workspace.get_dashboards", workspace_id=self.id):
+            url = self.api.BASE_URL + f"groups/{self.id}/dashboards"
+            response = self.api.make_api_get_request(url=url, headers=self.api.header, proxies=self.api.proxies)
+            self._load_dashboards(self.api.decode_json(response.content))
+
+    async def get_reports_async(self) -> None:
+        """Get all the reports and paginated reports from the workspace, without blocking the event loop
+
+        Raises:
+            TypeError: Case the API response is not a dictionary.
+        """
+        with tracer.span("workspace.get_reports_async", workspace_id=self.id):
+            data = await self.async_api.make_api_get_request(url=self.api.BASE_URL + f"groups/{self.id}/reports")
+            self._load_reports(data)
+
+    async def get_semantic_models_async(self) -> None:
+        """Get all the semantic models from the workspace, without blocking the event loop
+
+        Raises:
+            TypeError: Case the API response is not a dictionary.
+        """
+        with tracer.span("workspace.get_semantic_models_async", workspace_id=self.id):
+            data = await self.async_api.make_api_get_request(url=self.api.BASE_URL + f"groups/{self.id}/datasets")
+            self._load_semantic_models(data)
+
+    async def get_users_async(self, top: int = None, skip: int = None):
+        """Get users in the workspace, without blocking the event loop
+
+        Args:
+            top (int, optional): Number of users to return. Defaults to None.
+            skip (int, optional): Number of users to skip. Defaults to None.
+
+        Raises:
+            TypeError: Case the API response is not a dictionary.
+        """
+        with tracer.span("workspace.get_users_async", workspace_id=self.id):
+            data = await self.async_api.make_api_get_request(url=self._users_url(top, skip))
+            self._load_users(data)
+
+    async def get_dashboards_async(self):
+        with tracer.span("workspace.get_dashboards_async", workspace_id=self.id):
+            data = await self.async_api.make_api_get_request(url=self.api.BASE_URL + f"groups/{self.id}/dashboards")
+            self._load_dashboards(data)
@@ -0,0 +1,65 @@
+import threading
+
+
+class WorkspaceIndex:
+    """
+    #### Description:
+        Base of the indexes spanning every workspace of a service (lineage, access). The index follows the
+        workspaces of Service.workspaces and the collections listed in COLLECTIONS: Service reports each new set of
+        workspaces, and a tracked workspace reports each collection it is assigned, so the index stays up to date
+        while the collections hydrate. Workspaces that aren't in Service.workspaces, e.g. restored one at a time
+        from a snapshot, are ignored. Subclasses index the items in _add and unindex them in _remove.
+
+    #### Attributes:
+        COLLECTIONS (tuple): Workspace collections the index is built from.
+
+    #### Methods:
+        set_workspaces (returns None): Follows a new set of workspaces.
+        collection_changed (returns None): Follows a collection assigned to a workspace.
+    """
+
+    COLLECTIONS = ()
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._workspaces = {}  # Tracked workspace by id
+        self._items = {}  # Indexed collection by (workspace id, collection name), the set the workspace holds
+
+    def set_workspaces(self, workspaces) -> None:
+        """Follows a new set of Service.workspaces: drops the workspaces that left or were replaced by another
+        object with the same id, and indexes the collections of the new ones."""
+        current = {workspace.id: workspace for workspace in workspaces}
+        with self._lock:
+            for workspace_id, workspace in list(self._workspaces.items()):
+                if current.get(workspace_id) is not workspace:
+                    for name in self.COLLECTIONS:
+                        self._replace(workspace_id, name, ())
+                    del self._workspaces[workspace_id]
+            for workspace_id, workspace in current.items():
+                if workspace_id not in self._workspaces:
+                    self._workspaces[workspace_id] = workspace
+                    for name in self.COLLECTIONS:
+                        self._replace(workspace_id, name, getattr(workspace, name))
+
+    def collection_changed(self, workspace, name: str, items: set) -> None:
+        """Follows a collection assigned to a workspace, if the workspace is tracked."""
+        if name not in self.COLLECTIONS:
+            return
+        with self._lock:
+            if self._workspaces.get(workspace.id) is workspace:
+                self._replace(workspace.id, name, items)
+
+    def _replace(self, workspace_id: str, name: str, items) -> None:
+        """Unindexes the previous collection of a workspace and indexes items. Called with the lock held."""
+        for item in self._items.pop((workspace_id, name), ()):
+            self._remove(name, item)
+        if items:
+            for item in items:
+                self._add(name, item)
+            self._items[(workspace_id, name)] = items
+
+    def _add(self, name: str, item) -> None:
+        raise NotImplementedError
+
+    def _remove(self, name: str, item) -> None:
+        raise NotImplementedError
@@ -0,0 +1,92 @@
+"""Token refresh around expiry, against the local mock server. Run from the repository root:
+
+    python -m unittest discover tests
+"""
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import jwt
+
+os.environ.setdefault("APPDATA", tempfile.gettempdir())  # Logs and caches go under APPDATA, only set on Windows
+
+from benchmarks.mock_server import MockPowerBIServer, SyntheticTenant
+from src.APIBeacon import api as api_module
+from src.APIBeacon.api import AbstractPbiAPI
+from src.APIBeacon.credentials import CallableCredential
+
+
+def token(expires_in: float) -> str:
+    return jwt.encode({"upn": "refresh@contoso.com", "exp": int(time.time() + expires_in)}, "test-signing-key-of-32-bytes-long")
+
+
+class FailingRefreshCredential(CallableCredential):
+    """Returns a token expiring in expires_in seconds, then fails on every refresh."""
+
+    def __init__(self, expires_in: float) -> None:
+        self.calls = 0
+        super().__init__(self._provide, tenant_id="refresh", client_id=str(expires_in))
+        self.expires_in = expires_in
+
+    def _provide(self, *scopes) -> str:
+        self.calls += 1
+        if self.calls > 1:
+            raise RuntimeError("Token endpoint unavailable")
+        return token(self.expires_in)
+
+
+class TokenRefreshTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = MockPowerBIServer(SyntheticTenant(workspaces=3)).start()
+        cls.base_url = AbstractPbiAPI.BASE_URL
+        AbstractPbiAPI.BASE_URL = cls.server.base_url
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        AbstractPbiAPI.BASE_URL = cls.base_url
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.server.reset_counters()
+
+    def get_workspaces(self, api: AbstractPbiAPI, count: int = 5) -> None:
+        for _ in range(count):
+            api.make_api_get_request(self.server.base_url + "groups", use_cache=False)
+
+    def test_failed_refresh_keeps_sending_with_valid_token(self) -> None:
+        credential = FailingRefreshCredential(expires_in=200)  # Inside TOKEN_REFRESH_MARGIN
+        api = AbstractPbiAPI(credential=credential)
+        self.addCleanup(api.close)
+
+        self.get_workspaces(api)
+        api.ensure_fresh_token()  # What the background thread runs: the failure is logged, not raised
+        self.get_workspaces(api)
+
+        self.assertEqual(self.server.request_count, 10)
+        self.assertEqual(credential.calls, 2)  # One failed refresh, then TOKEN_REFRESH_RETRY before the next one
+
+    def test_failed_refresh_raises_once_token_expired(self) -> None:
+        api = AbstractPbiAPI(credential=FailingRefreshCredential(expires_in=2))
+        self.addCleanup(api.close)
+        time.sleep(max(0.0, api.token_expires_on - time.time()) + 0.1)
+
+        with self.assertRaises(RuntimeError):
+            self.get_workspaces(api, count=1)
+        self.assertEqual(self.server.request_count, 0)
+
+    def test_saved_token_is_never_refreshed_interactively(self) -> None:
+        with mock.patch.object(api_module, "InteractiveBrowserCredential", side_effect=AssertionError("interactive login")):
+            api = AbstractPbiAPI(saved_token=token(200))
+            self.addCleanup(api.close)
+            self.get_workspaces(api)
+
+        self.assertEqual(self.server.request_count, 5)
+        self.assertIsNone(api._credential)
+
+
+if __name__ == "__main__":
+    unittest.main()